@@ -3,14 +3,19 @@ import logging
 import io
 import json
 import re
+import uuid
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Iterator, Optional, List
 from dataclasses import dataclass
-import openai
-import google.generativeai as genai
 from docx import Document
 from pypdf import PdfReader
+from articles import Article
+from cache import AnalysisCache
+from llm_providers import LLMProvider, as_completed_sync, create_provider, iter_streams, run_sync
 from news_scraper import NewsScraperModule
+from news_index import NewsCrawler
+from tracing import span, tracer
 
 # New imports for video parsing
 try:
@@ -179,6 +184,35 @@ etc.
 Generate the post now following the {template_style} style and using the hook naturally.
 Output ONLY the post content."""
 
+ANALYSIS_PROMPT = """
+Analyze this content and respond with valid JSON only:
+
+{{
+    "topic": "Main topic or theme",
+    "insights": ["Key insight 1", "Key insight 2", "Key insight 3"],
+    "tone": "Neutral/Positive/Negative/Emotional",
+    "trending": "High/Medium/Low",
+    "accuracy": "High/Medium/Low"
+}}
+
+Content: {content}
+"""
+
+# Part of the analysis cache key; bump whenever ANALYSIS_PROMPT changes
+ANALYSIS_PROMPT_VERSION = 1
+
+# Appended to POST_GENERATION_PROMPT when every variation comes from one JSON completion
+MULTI_VARIATION_PROMPT = """
+
+---
+
+VARIATIONS:
+Write {count} DISTINCT variations of this post instead of one. Each must use a different hook and angle:
+{variation_hooks}
+
+Instead of the plain post, respond with valid JSON only:
+{{"posts": ["variation 1", "variation 2", ...]}}"""
+
 LINKEDIN_POST_PROMPT = """Create a LinkedIn post about {topic}:
 
 TEMPLATE STYLE: {template_style}
@@ -205,6 +239,18 @@ Generate the LinkedIn post now.
 Output ONLY the post content with proper formatting."""
 
 
+@st.cache_resource
+def get_analysis_cache() -> AnalysisCache:
+    """Process-wide analysis cache shared by every session"""
+    return AnalysisCache()
+
+
+@st.cache_resource
+def get_news_crawler() -> NewsCrawler:
+    """Process-wide background crawler feeding the local news index"""
+    return NewsCrawler(NewsScraperModule())
+
+
 class VideoParser:
     """Handle YouTube and Instagram video parsing"""
     
@@ -357,6 +403,8 @@ class XPostGeneratorApp:
         "Article Thread (Multiple tweets)": 0
     }
     
+    NEWS_PREFETCH_COUNT = 10
+    
     API_OPTIONS = ["OpenAI", "Gemini", "OpenRouter"]
     OPENAI_MODELS = ["gpt-4o-mini", "gpt-4o", "gpt-3.5-turbo"]
     GEMINI_MODELS = ["gemini-1.5-flash", "gemini-1.5-pro"]
@@ -382,7 +430,10 @@ class XPostGeneratorApp:
         self._setup_logging()
         self._setup_page_config()
         self._initialize_session_state()
-        self.news_scraper = NewsScraperModule()
+        # Keep one scraper per session so its pooled HTTP connections survive reruns
+        if "news_scraper" not in st.session_state:
+            st.session_state.news_scraper = NewsScraperModule()
+        self.news_scraper = st.session_state.news_scraper
         self.video_parser = VideoParser()
 
     def _setup_logging(self):
@@ -417,12 +468,16 @@ class XPostGeneratorApp:
             "enhanced_posts": [],
             "content_analysis": None,
             "num_variations": 1,
+            "single_request_variations": False,
+            "stream_output": True,
             "trending_articles": [],
             "selected_articles": [],
             "linkedin_posts": [],
             "manual_input_content": "",
             "video_content": None,
-            "video_analysis": None
+            "video_analysis": None,
+            "show_performance": False,
+            "trace_session": uuid.uuid4().hex[:12]
         }
         
         for key, value in defaults.items():
@@ -471,34 +526,37 @@ class XPostGeneratorApp:
         return text_blob
 
     def setup_api(self, api_key: str, provider: str, model: str):
-        """Setup API client based on provider and model"""
+        """Setup API client based on provider and model
+        
+        The client is kept in session state and reused across reruns (keeping its
+        connection pool warm); it is only rebuilt, and the old one closed, when the
+        provider, key or model changes.
+        """
         if not api_key:
             st.error(f"{provider} API key required.")
             return None
 
+        client_key = (provider, api_key, model)
+        current = st.session_state.get("api_client")
+        if current is not None and st.session_state.get("api_client_key") == client_key:
+            return current
+
         try:
-            if provider == "OpenAI":
-                client = openai.OpenAI(api_key=api_key)
-                return {"type": "openai", "model": model, "client": client}
-                
-            elif provider == "Gemini":
-                genai.configure(api_key=api_key)
-                return genai.GenerativeModel(model)
-                
-            elif provider == "OpenRouter":
-                client = openai.OpenAI(
-                    api_key=api_key,
-                    base_url="https://openrouter.ai/api/v1"
-                )
-                return {"type": "openrouter", "model": model, "client": client}
-                
+            client = create_provider(provider, api_key, model)
+            if current is not None:
+                try:
+                    current.close()
+                except Exception as e:
+                    self.logger.warning(f"Closing previous API client failed: {e}")
+            st.session_state.api_client_key = client_key
+            return client
         except Exception as e:
             st.error(f"API setup failed: {str(e)}")
             self.logger.error(f"API setup error: {e}")
             
         return None
 
-    def analyze_content(self, content: str, api_config) -> Dict:
+    def analyze_content(self, content: str, api_config: LLMProvider) -> Dict:
         """Analyze input content using API"""
         if not content or not content.strip():
             return {"error": "No content provided."}
@@ -515,44 +573,36 @@ class XPostGeneratorApp:
                 "accuracy": "Medium"
             }
 
-        analysis_prompt = f"""
-Analyze this content and respond with valid JSON only:
+        analysis_input = content[:2000]
+        cache = get_analysis_cache()
+        cache_key = cache.key(analysis_input, api_config.name, api_config.model, ANALYSIS_PROMPT_VERSION)
+        with span("analysis.cache", **self._llm_attrs(api_config)) as cache_span:
+            cached = cache.get(cache_key)
+            cache_span.set(hit=cached is not None)
+        if cached is not None:
+            return cached
 
-{{
-    "topic": "Main topic or theme",
-    "insights": ["Key insight 1", "Key insight 2", "Key insight 3"],
-    "tone": "Neutral/Positive/Negative/Emotional",
-    "trending": "High/Medium/Low",
-    "accuracy": "High/Medium/Low"
-}}
-
-Content: {content[:2000]}
-"""
+        analysis_prompt = ANALYSIS_PROMPT.format(content=analysis_input)
         
         try:
-            if isinstance(api_config, dict) and api_config.get("type") in ["openai", "openrouter"]:
-                client = api_config.get("client")
-                response = client.chat.completions.create(
-                    model=api_config.get("model", "gpt-4o-mini"),
-                    messages=[
-                        {"role": "system", "content": "You are a JSON generator. Return only valid JSON."},
-                        {"role": "user", "content": analysis_prompt}
-                    ],
+            with span("llm.analyze", prompt_chars=len(analysis_prompt), **self._llm_attrs(api_config)) as llm_span:
+                completion = api_config.complete(
+                    analysis_prompt,
+                    system="You are a JSON generator. Return only valid JSON.",
                     temperature=0.1,
                     max_tokens=500,
-                    response_format={"type": "json_object"}
+                    json_mode=True
                 )
-                analysis_text = response.choices[0].message.content
-            else:
-                response = api_config.generate_content(analysis_prompt)
-                analysis_text = response.text
+                analysis_text = completion.text
+                self._record_llm_usage(llm_span, completion)
 
             analysis_text = analysis_text.strip().replace("```json", "").replace("```", "")
             analysis = json.loads(analysis_text)
             
             if not isinstance(analysis.get("insights"), list):
                 analysis["insights"] = [str(analysis.get("insights", ""))] if analysis.get("insights") else []
-                
+            
+            cache.put(cache_key, analysis, api_config.name, api_config.model, ANALYSIS_PROMPT_VERSION)
             return analysis
             
         except json.JSONDecodeError as e:
@@ -568,8 +618,8 @@ Content: {content[:2000]}
             self.logger.error(f"Analysis error: {e}")
             return {"error": f"Analysis failed: {str(e)}"}
 
-    def generate_post(self, content: str, api_config, analysis: Dict, variation_num: int = 1) -> Dict:
-        """Generate X post using template system"""
+    def _prepare_post(self, content: str, analysis: Dict, variation_num: int = 1) -> Dict:
+        """Validate inputs and build the prompt and sampling settings for one X post variation"""
         if analysis is None or not isinstance(analysis, dict):
             return {"error": "Valid analysis is required"}
             
@@ -634,53 +684,189 @@ Content: {content[:2000]}
             custom_instructions=custom_instructions or "None"
         )
         
-        try:
-            temperature = 0.8 + (variation_num - 1) * 0.05
-            
-            if isinstance(api_config, dict) and api_config.get("type") in ["openai", "openrouter"]:
-                client = api_config.get("client")
-                response = client.chat.completions.create(
-                    model=api_config.get("model", "gpt-4o-mini"),
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=min(temperature, 1.0),
-                    max_tokens=2000 if is_thread else 600
-                )
-                post_content = response.choices[0].message.content.strip()
-            else:
-                response = api_config.generate_content(prompt)
-                post_content = response.text.strip()
+        return {
+            "prompt": prompt,
+            "selected_hook": selected_hook,
+            "temperature": min(0.8 + (variation_num - 1) * 0.05, 1.0),
+            "max_tokens": 2000 if is_thread else 600,
+            "template": template_style,
+            "hook_category": hook_category,
+            "length_type": length,
+            "is_thread": is_thread,
+            "max_chars": max_chars,
+            "trending": analysis.get("trending"),
+            "variation": variation_num
+        }
 
-            first_line = post_content.split('\n')[0][:100]
-            hook_used = first_line if len(first_line) > 10 else "Custom hook"
-            char_count = len(post_content)
+    def _build_post(self, request: Dict, post_content: str) -> Dict:
+        """Turn generated text into the post dict shown in the X posts view"""
+        first_line = post_content.split('\n')[0][:100]
+        hook_used = first_line if len(first_line) > 10 else "Custom hook"
+        char_count = len(post_content)
+        is_thread = request["is_thread"]
+        max_chars = request["max_chars"]
+
+        tips = [
+            "Post during peak hours (8-10am, 5-7pm)",
+            "Ask questions to encourage replies",
+            "Use clear, action-oriented language"
+        ]
+        if request["trending"] == "High":
+            tips.append("Leverage trending topics for visibility")
 
-            tips = [
-                "Post during peak hours (8-10am, 5-7pm)",
-                "Ask questions to encourage replies",
-                "Use clear, action-oriented language"
-            ]
-            if analysis.get("trending") == "High":
-                tips.append("Leverage trending topics for visibility")
+        return {
+            "template": request["template"],
+            "hook_category": request["hook_category"],
+            "length_type": request["length_type"],
+            "max_chars": max_chars if not is_thread else None,
+            "char_count": f"~{char_count} chars" + (f"/{max_chars}" if not is_thread else ""),
+            "content": post_content,
+            "engagement_tips": tips,
+            "quality_check": "Ready to post",
+            "hook_used": hook_used,
+            "variation": request["variation"]
+        }
 
-            return {
-                "template": template_style,
-                "hook_category": hook_category,
-                "length_type": length,
-                "max_chars": max_chars if not is_thread else None,
-                "char_count": f"~{char_count} chars" + (f"/{max_chars}" if not is_thread else ""),
-                "content": post_content,
-                "engagement_tips": tips,
-                "quality_check": "Ready to post",
-                "hook_used": hook_used,
-                "variation": variation_num
-            }
+    async def _agenerate_post(self, api_config: LLMProvider, request: Dict) -> Dict:
+        """Run one prepared X post request"""
+        try:
+            with span("llm.generate_post", prompt_chars=len(request["prompt"]), variation=request["variation"],
+                      **self._llm_attrs(api_config)) as llm_span:
+                completion = await api_config.acomplete(
+                    request["prompt"],
+                    temperature=request["temperature"],
+                    max_tokens=request["max_tokens"]
+                )
+                self._record_llm_usage(llm_span, completion)
+            return self._build_post(request, completion.text.strip())
             
         except Exception as e:
             self.logger.error(f"Generation error: {e}")
             return {"error": f"Generation failed: {str(e)}"}
 
-    def generate_linkedin_post(self, content: str, analysis: Dict) -> Dict:
-        """Generate LinkedIn post"""
+    def _stream_posts(self, api_config: LLMProvider, requests: List[Dict],
+                      on_partial: Callable[[int, str], None]) -> Iterator[Dict]:
+        """Stream prepared X post requests, calling on_partial(variation, text so far) per delta"""
+        streams = [
+            api_config.stream(
+                request["prompt"],
+                temperature=request["temperature"],
+                max_tokens=request["max_tokens"],
+                span_name="llm.generate_post",
+                prompt_chars=len(request["prompt"]),
+                variation=request["variation"]
+            )
+            for request in requests
+        ]
+        texts = [""] * len(streams)
+        for index, delta in iter_streams(streams):
+            if delta is not None:
+                texts[index] += delta
+                on_partial(requests[index]["variation"], texts[index])
+                continue
+            
+            error = streams[index].error
+            if error is not None:
+                self.logger.error(f"Generation error: {error}")
+                yield {"error": f"Generation failed: {str(error)}"}
+            else:
+                yield self._build_post(requests[index], streams[index].completion.text.strip())
+
+    def generate_post(self, content: str, api_config: LLMProvider, analysis: Dict, variation_num: int = 1,
+                      on_partial: Optional[Callable[[str], None]] = None) -> Dict:
+        """Generate X post using template system; on_partial streams the text as it arrives"""
+        request = self._prepare_post(content, analysis, variation_num)
+        if "prompt" not in request:
+            return request
+        if on_partial:
+            return next(self._stream_posts(api_config, [request], lambda _, text: on_partial(text)))
+        return run_sync(self._agenerate_post(api_config, request))
+
+    def generate_posts(self, content: str, api_config: LLMProvider, analysis: Dict, count: int,
+                       single_request: bool = False,
+                       on_partial: Optional[Callable[[int, str], None]] = None) -> Iterator[Dict]:
+        """Generate ``count`` X post variations concurrently, yielding each one as it finishes
+
+        Requests share the LLM loop, so the provider's concurrency cap applies.
+        With ``single_request`` all variations come from one completion instead.
+        With ``on_partial`` they are streamed and it receives (variation, text so far).
+        """
+        requests = [self._prepare_post(content, analysis, i + 1) for i in range(count)]
+        if "prompt" not in requests[0]:
+            yield requests[0]
+            return
+        if single_request and count > 1:
+            yield from self._generate_posts_single_request(api_config, requests)
+            return
+        if on_partial:
+            yield from self._stream_posts(api_config, requests, on_partial)
+            return
+        for post in as_completed_sync(self._agenerate_post(api_config, request) for request in requests):
+            if isinstance(post, BaseException):
+                post = {"error": f"Generation failed: {post}"}
+            yield post
+
+    def _generate_posts_single_request(self, api_config: LLMProvider, requests: List[Dict]) -> List[Dict]:
+        """Generate every variation with one completion
+
+        Uses the provider's ``n`` parameter when it has one (same prompt, sampled
+        ``n`` times), otherwise asks for a JSON array of distinct variations.
+        """
+        count = len(requests)
+        first = requests[0]
+        temperature = requests[-1]["temperature"]
+        try:
+            if api_config.supports_n:
+                with span("llm.generate_posts", prompt_chars=len(first["prompt"]), variations=count, mode="n",
+                          **self._llm_attrs(api_config)) as llm_span:
+                    completion = api_config.complete(
+                        first["prompt"],
+                        temperature=temperature,
+                        max_tokens=first["max_tokens"],
+                        n=count
+                    )
+                    self._record_llm_usage(llm_span, completion)
+                texts = [text.strip() for text in completion.choices if text.strip()]
+            else:
+                variation_hooks = "\n".join(
+                    f"{request['variation']}. {request['selected_hook']}" for request in requests
+                )
+                prompt = first["prompt"] + MULTI_VARIATION_PROMPT.format(count=count, variation_hooks=variation_hooks)
+                with span("llm.generate_posts", prompt_chars=len(prompt), variations=count, mode="json",
+                          **self._llm_attrs(api_config)) as llm_span:
+                    completion = api_config.complete(
+                        prompt,
+                        temperature=temperature,
+                        max_tokens=first["max_tokens"] * count,
+                        json_mode=True
+                    )
+                    self._record_llm_usage(llm_span, completion)
+                texts = self._parse_variations(completion.text)
+        except Exception as e:
+            self.logger.error(f"Generation error: {e}")
+            return [{"error": f"Generation failed: {str(e)}"}]
+
+        if not texts:
+            return [{"error": "Generation failed: empty response"}]
+        return [self._build_post(request, text) for request, text in zip(requests, texts)]
+
+    def _parse_variations(self, text: str) -> List[str]:
+        """Post texts from a ``{"posts": [...]}`` response; unparseable text counts as one post"""
+        text = text.strip().replace("```json", "").replace("```", "").strip()
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            self.logger.error(f"JSON parse error: {e}")
+            return [text] if text else []
+
+        posts = data.get("posts") if isinstance(data, dict) else data
+        if not isinstance(posts, list):
+            return [text]
+        return [str(post).strip() for post in posts if str(post).strip()]
+
+    def generate_linkedin_post(self, content: str, analysis: Dict,
+                               on_partial: Optional[Callable[[str], None]] = None) -> Dict:
+        """Generate LinkedIn post; on_partial streams the text as it arrives"""
         if analysis is None or not isinstance(analysis, dict):
             return {"error": "Valid analysis is required"}
             
@@ -704,18 +890,20 @@ Content: {content[:2000]}
         )
         
         try:
-            if isinstance(st.session_state.api_client, dict) and st.session_state.api_client.get("type") in ["openai", "openrouter"]:
-                client = st.session_state.api_client.get("client")
-                response = client.chat.completions.create(
-                    model=st.session_state.api_client.get("model", "gpt-4o-mini"),
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.7,
-                    max_tokens=1500
-                )
-                post_content = response.choices[0].message.content.strip()
+            provider = st.session_state.api_client
+            if on_partial:
+                stream = provider.stream(prompt, temperature=0.7, max_tokens=1500,
+                                         span_name="llm.generate_linkedin", prompt_chars=len(prompt))
+                text = ""
+                for delta in stream:
+                    text += delta
+                    on_partial(text)
+                post_content = stream.completion.text.strip()
             else:
-                response = st.session_state.api_client.generate_content(prompt)
-                post_content = response.text.strip()
+                with span("llm.generate_linkedin", prompt_chars=len(prompt), **self._llm_attrs(provider)) as llm_span:
+                    completion = provider.complete(prompt, temperature=0.7, max_tokens=1500)
+                    post_content = completion.text.strip()
+                    self._record_llm_usage(llm_span, completion)
             
             char_count = len(post_content)
             
@@ -731,6 +919,18 @@ Content: {content[:2000]}
             self.logger.error(f"LinkedIn generation error: {e}")
             return {"error": f"Generation failed: {str(e)}"}
 
+    def _llm_attrs(self, provider: LLMProvider) -> Dict:
+        """Provider and model of an API client, for tracing"""
+        return {"provider": provider.name, "model": provider.model}
+
+    def _record_llm_usage(self, llm_span, completion):
+        """Attach response size and token usage (when the provider reports it) to a span"""
+        llm_span.set(
+            response_chars=len(completion.text),
+            prompt_tokens=completion.prompt_tokens,
+            completion_tokens=completion.completion_tokens
+        )
+
     def _evaluate_virality(self, post_text: str, post_type: str = "") -> Dict:
         """Evaluate post's virality potential"""
         score = 5
@@ -932,10 +1132,29 @@ Content: {content[:2000]}
                 st.session_state.get("num_variations", 1)
             )
             
+            st.session_state.single_request_variations = st.checkbox(
+                "Generate Variations in One Request",
+                value=st.session_state.get("single_request_variations", False),
+                help="Sends the prompt once for all variations: fewer tokens, less variety",
+                disabled=st.session_state.num_variations < 2
+            )
+            
+            st.session_state.stream_output = st.checkbox(
+                "Stream Output",
+                value=st.session_state.get("stream_output", True),
+                help="Show posts as they are written instead of waiting for the full response"
+            )
+            
             st.session_state.virality_enabled = st.checkbox(
                 "Show Virality Score", 
                 value=st.session_state.get("virality_enabled", True)
             )
+            
+            st.session_state.show_performance = st.checkbox(
+                "Show Performance Panel",
+                value=st.session_state.get("show_performance", False),
+                help="Timing of each fetch, extraction and LLM call in this session"
+            )
 
             st.divider()
             
@@ -1127,7 +1346,7 @@ Content: {content[:2000]}
                     if not hasattr(st.session_state, 'api_client'):
                         st.error("⚠️ Configure API in sidebar first")
                     else:
-                        with st.spinner("Analyzing content..."):
+                        with st.spinner("Analyzing content..."), self._ui_span("ui.analyze"):
                             analysis = self.analyze_content(
                                 st.session_state.manual_input_content, 
                                 st.session_state.api_client
@@ -1156,7 +1375,7 @@ Content: {content[:2000]}
                     if not hasattr(st.session_state, 'api_client'):
                         st.error("⚠️ Configure API in sidebar first")
                     else:
-                        with st.spinner("Analyzing and generating..."):
+                        with st.spinner("Analyzing and generating..."), self._ui_span("ui.generate_x_post"):
                             analysis = self.analyze_content(
                                 st.session_state.manual_input_content, 
                                 st.session_state.api_client
@@ -1165,17 +1384,25 @@ Content: {content[:2000]}
                             
                             if "error" not in analysis:
                                 num_vars = st.session_state.get("num_variations", 1)
-                                for i in range(num_vars):
-                                    post = self.generate_post(
-                                        st.session_state.manual_input_content, 
-                                        st.session_state.api_client, 
-                                        analysis, 
-                                        i + 1
-                                    )
+                                single_request = st.session_state.get("single_request_variations", False)
+                                progress = st.empty()
+                                done = 0
+                                for post in self.generate_posts(
+                                    st.session_state.manual_input_content, 
+                                    st.session_state.api_client, 
+                                    analysis, 
+                                    num_vars,
+                                    single_request=single_request,
+                                    on_partial=None if single_request and num_vars > 1 else self._live_preview(num_vars)
+                                ):
+                                    done += 1
                                     if "error" not in post:
                                         if st.session_state.get("video_content"):
                                             post["source_video"] = st.session_state.video_content.get("title") or "Video content"
                                         st.session_state.generated_posts.append(post)
+                                        progress.info(f"✍️ Variation {post.get('variation', done)} ready ({done}/{num_vars})")
+                                    else:
+                                        progress.warning(f"⚠️ {post['error']} ({done}/{num_vars})")
                                 
                                 if st.session_state.generated_posts:
                                     st.success(f"✅ Generated {num_vars} post(s)! Check 'X Posts' tab")
@@ -1188,14 +1415,18 @@ Content: {content[:2000]}
                     if not hasattr(st.session_state, 'api_client'):
                         st.error("⚠️ Configure API in sidebar first")
                     else:
-                        with st.spinner("Generating LinkedIn post..."):
+                        with st.spinner("Generating LinkedIn post..."), self._ui_span("ui.generate_linkedin_post"):
                             analysis = self.analyze_content(
                                 st.session_state.manual_input_content, 
                                 st.session_state.api_client
                             )
                             
                             if "error" not in analysis:
-                                post = self.generate_linkedin_post(st.session_state.manual_input_content, analysis)
+                                post = self.generate_linkedin_post(
+                                    st.session_state.manual_input_content,
+                                    analysis,
+                                    on_partial=self._live_preview()
+                                )
                                 if "error" not in post:
                                     if st.session_state.get("video_content"):
                                         post["source_video"] = st.session_state.video_content.get("title") or "Video content"
@@ -1220,10 +1451,11 @@ Content: {content[:2000]}
                 key="news_keywords"
             )
             
+            available_sources = self.news_scraper.available_sources()
             sources = st.multiselect(
                 "News Sources",
-                ["Hacker News", "Reddit", "TechCrunch", "VentureBeat"],
-                default=["Hacker News", "TechCrunch"],
+                available_sources,
+                default=[name for name in ["Hacker News", "TechCrunch"] if name in available_sources],
                 key="news_sources"
             )
         
@@ -1242,64 +1474,172 @@ Content: {content[:2000]}
             timeframe_days = timeframe_map[timeframe_label]
             
             max_articles = st.slider("Max Articles", 5, 50, 20)
+            
+            prefetch = st.checkbox(
+                f"⚡ Prefetch top {self.NEWS_PREFETCH_COUNT} articles in the background",
+                value=False,
+                key="news_prefetch",
+                help="Extract article content right after discovery so post generation starts instantly"
+            )
+            
+            crawler = get_news_crawler()
+            crawl = st.checkbox(
+                "🗂️ Keep local news index updated in the background",
+                value=crawler.running,
+                help="Periodically pulls all sources into a local full-text index so searches answer instantly"
+            )
+            if crawl and not crawler.running:
+                crawler.start()
+            elif not crawl and crawler.running:
+                crawler.stop()
+            if crawler.last_run:
+                st.caption(f"Last crawl: {datetime.fromtimestamp(crawler.last_run).strftime('%H:%M:%S')}")
         
         if st.button("🔍 Find Trending News", type="primary"):
             if not sources:
                 st.error("Please select at least one news source")
             else:
-                with st.spinner("Searching..."):
+                with st.spinner(f"Searching (up to {self.news_scraper.deadline_s:.0f}s)..."), self._ui_span("ui.find_news"):
                     try:
                         articles = self.news_scraper.fetch_all_news(
                             keywords=keywords.strip() if keywords else "",
                             timeframe_days=timeframe_days,
-                            sources=sources
+                            sources=sources,
+                            max_articles=max_articles
                         )
                         
-                        st.session_state.trending_articles = articles[:max_articles]
+                        st.session_state.trending_articles = articles
+                        
+                        # A new article list makes any earlier prefetch batch obsolete
+                        if prefetch:
+                            self.news_scraper.prefetch_articles(
+                                st.session_state.trending_articles,
+                                top_n=self.NEWS_PREFETCH_COUNT
+                            )
+                        else:
+                            self.news_scraper.cancel_prefetch()
                         
                         if articles:
                             st.success(f"✅ Found {len(st.session_state.trending_articles)} articles!")
                         else:
                             st.warning("⚠️ No articles found")
+                        
+                        report = self.news_scraper.last_fetch_report
+                        timed_out = [name for name, info in report.items() if info["status"] == "timeout"]
+                        failed = [name for name, info in report.items() if info["status"] == "error"]
+                        skipped = [name for name, info in report.items() if info["status"] == "skipped"]
+                        if timed_out:
+                            st.warning(f"⏱️ Skipped (too slow): {', '.join(timed_out)}")
+                        if failed:
+                            st.warning(f"⚠️ Failed: {', '.join(failed)}")
+                        if skipped:
+                            st.warning(f"🔌 Temporarily skipped after repeated failures: {', '.join(skipped)}")
                             
                     except Exception as e:
                         st.error(f"Error: {str(e)}")
         
+        self._render_source_health()
+        self._render_feed_manager()
+        
         if st.session_state.get("trending_articles"):
             st.markdown("---")
             st.markdown("### 📰 Trending Articles")
             
             for idx, article in enumerate(st.session_state.trending_articles[:20]):
                 with st.expander(
-                    f"⭐ {article.get('score', 0)} | {article['title'][:80]}",
+                    f"⭐ {article.score} | {article.title[:80]}",
                     expanded=idx < 3
                 ):
                     col_info, col_actions = st.columns([3, 1])
                     
                     with col_info:
-                        st.markdown(f"**{article['title']}**")
-                        st.caption(f"📰 {article['source']} | 📅 {article['date']}")
-                        st.markdown(f"[🔗 Read Article]({article['url']})")
+                        st.markdown(f"**{article.title}**")
+                        sources = ", ".join(article.sources)
+                        st.caption(f"📰 {sources} | 📅 {article.date}")
+                        st.markdown(f"[🔗 Read Article]({article.url})")
                     
+                    platform = None
                     with col_actions:
                         if st.button("🐦 X Post", key=f"x_{idx}", use_container_width=True):
-                            self._generate_from_article(article, "X")
+                            platform = "X"
                         
                         if st.button("💼 LinkedIn", key=f"li_{idx}", use_container_width=True):
-                            self._generate_from_article(article, "LinkedIn")
-
-    def _generate_from_article(self, article: Dict, platform: str):
+                            platform = "LinkedIn"
+                    
+                    # Generate below the columns so the streamed preview gets the full width
+                    if platform:
+                        self._generate_from_article(article, platform)
+
+    def _render_source_health(self):
+        """Per-source success rate, latency and circuit state"""
+        health = self.news_scraper.health_report()
+        if not any(h["requests"] for h in health):
+            return
+        
+        unhealthy = [h["source"] for h in health if h["state"] != "closed"]
+        label = "🩺 Source Health" + (f" - ⚠️ {', '.join(unhealthy)} unavailable" if unhealthy else "")
+        with st.expander(label, expanded=bool(unhealthy)):
+            rows = []
+            for h in health:
+                status = {"closed": "✅ OK", "open": "🔌 Paused", "half-open": "🔄 Retrying"}[h["state"]]
+                if h["retry_in_s"]:
+                    status += f" (retry in {h['retry_in_s']:.0f}s)"
+                rows.append({
+                    "Source": h["source"],
+                    "Status": status,
+                    "Success": f"{h['success_rate']:.0%}" if h["success_rate"] is not None else "-",
+                    "Latency": f"{h['latency_s']:.2f}s" if h["latency_s"] is not None else "-",
+                    "Last Error": h["last_error"] or ""
+                })
+            st.dataframe(rows, hide_index=True, use_container_width=True)
+    
+    def _render_feed_manager(self):
+        """Add RSS/Atom feeds by URL or OPML import"""
+        registry = self.news_scraper.registry
+        with st.expander(f"📡 Manage Feeds ({len(registry)})"):
+            for feed in registry.feeds:
+                col_feed, col_remove = st.columns([4, 1])
+                col_feed.caption(f"**{feed.name}** - {feed.url}")
+                if col_remove.button("Remove", key=f"remove_feed_{feed.name}"):
+                    registry.remove_feed(feed.name)
+                    self.news_scraper.save_feeds()
+                    st.rerun()
+            
+            col_name, col_url = st.columns([1, 2])
+            with col_name:
+                feed_name = st.text_input("Feed name", key="new_feed_name")
+            with col_url:
+                feed_url = st.text_input("Feed URL", placeholder="https://example.com/feed.xml", key="new_feed_url")
+            
+            if st.button("➕ Add Feed"):
+                try:
+                    registry.add_feed(feed_name, feed_url)
+                    self.news_scraper.save_feeds()
+                    st.success(f"✅ Added {feed_name.strip()}")
+                except ValueError as e:
+                    st.error(str(e))
+            
+            opml_file = st.file_uploader("Import OPML", type=["opml", "xml"], key="opml_upload")
+            if opml_file is not None and st.button("📥 Import Feeds"):
+                try:
+                    imported = registry.import_opml(opml_file.getvalue())
+                    self.news_scraper.save_feeds()
+                    st.success(f"✅ Imported {len(imported)} feeds")
+                except Exception as e:
+                    st.error(f"Error: {str(e)}")
+    
+    def _generate_from_article(self, article: Article, platform: str):
         """Generate post from selected article"""
         if not hasattr(st.session_state, 'api_client'):
             st.error("⚠️ Configure API in sidebar first")
             return
         
-        with st.spinner(f"Generating {platform} post..."):
+        with st.spinner(f"Generating {platform} post..."), self._ui_span("ui.generate_from_article", platform=platform):
             try:
-                content = self.news_scraper.extract_article_content(article['url'])
+                content = self.news_scraper.extract_article_content(article.url)
                 
                 if not content:
-                    content = f"Title: {article['title']}\nSource: {article['source']}"
+                    content = f"Title: {article.title}\nSource: {article.source}"
                 
                 analysis = self.analyze_content(content, st.session_state.api_client)
                 
@@ -1308,16 +1648,17 @@ Content: {content[:2000]}
                     return
                 
                 if platform == "X":
-                    post = self.generate_post(content, st.session_state.api_client, analysis, 1)
+                    post = self.generate_post(content, st.session_state.api_client, analysis, 1,
+                                              on_partial=self._live_preview())
                     if "error" not in post:
-                        post["source_article"] = article['title']
+                        post["source_article"] = article.title
                         st.session_state.generated_posts.append(post)
                         st.success("✅ X post generated!")
                         st.rerun()
                 else:
-                    post = self.generate_linkedin_post(content, analysis)
+                    post = self.generate_linkedin_post(content, analysis, on_partial=self._live_preview())
                     if "error" not in post:
-                        post["source_article"] = article['title']
+                        post["source_article"] = article.title
                         st.session_state.linkedin_posts.append(post)
                         st.success("✅ LinkedIn post generated!")
                         st.rerun()
@@ -1441,6 +1782,70 @@ Content: {content[:2000]}
                     key=f"dl_x_{idx}"
                 )
 
+    def _live_preview(self, count: int = 1) -> Optional[Callable]:
+        """on_partial callback rendering streamed text into placeholders, or None when streaming is off
+
+        With ``count`` > 1 the callback takes (variation, text); otherwise just text.
+        """
+        if not st.session_state.get("stream_output", True):
+            return None
+        slots = [st.empty() for _ in range(count)]
+        
+        def render(variation: int, text: str):
+            label = f"**Variation {variation}**\n" if count > 1 else ""
+            with slots[variation - 1].container():
+                if label:
+                    st.markdown(label)
+                st.code(text + "▌", language=None)
+        
+        if count > 1:
+            return render
+        return lambda text: render(1, text)
+
+    def _ui_span(self, name: str, **attrs):
+        """Root span for a user action, tagged with this session so the panel can filter it"""
+        return span(name, session=st.session_state.trace_session, **attrs)
+
+    def _render_performance_panel(self):
+        """Stage-by-stage timings of this session's recent actions"""
+        session = st.session_state.trace_session
+        traces = tracer.traces(limit=5, where=lambda root: root["attrs"].get("session") == session)
+        
+        st.markdown("---")
+        st.subheader("📈 Performance")
+        if not traces:
+            st.info("💡 Run a search or generate a post to see where the time goes")
+            return
+        
+        for index, spans in enumerate(traces):
+            # Bound background work can finish after the root closes, so find it by parent
+            root = next(record for record in spans if record["parent"] is None)
+            started = datetime.fromtimestamp(root["start"]).strftime("%H:%M:%S")
+            with st.expander(f"{root['name']} - {root['duration_ms'] / 1000:.2f}s ({started})", expanded=index == 0):
+                depth = {root["span"]: 0}
+                children: Dict[str, List[Dict]] = {}
+                for record in spans:
+                    children.setdefault(record["parent"], []).append(record)
+                
+                rows = []
+                stack = [root]
+                while stack:
+                    record = stack.pop()
+                    level = depth[record["span"]]
+                    rows.append({
+                        "Stage": "  " * level + record["name"],
+                        "ms": record["duration_ms"],
+                        "Status": record["status"] if not record["error"] else record["error"],
+                        "Details": ", ".join(f"{k}={v}" for k, v in record["attrs"].items() if k != "session")
+                    })
+                    # Reverse so the earliest child is popped (shown) first
+                    for child in sorted(children.get(record["span"], []), key=lambda r: r["start"], reverse=True):
+                        depth[child["span"]] = level + 1
+                        stack.append(child)
+                st.dataframe(rows, hide_index=True, use_container_width=True)
+        
+        st.caption(f"Full traces are written to {tracer.path}" if tracer.path else "Trace file disabled")
+
     def render_footer(self):
         """Render footer"""
         st.markdown("---")
@@ -1450,6 +1855,8 @@ Content: {content[:2000]}
         """Main entry point"""
         self.render_sidebar()
         self.render_main_content()
+        if st.session_state.get("show_performance"):
+            self._render_performance_panel()
         self.render_footer()
 
 
@@ -0,0 +1,174 @@
+import codecs
+from html.parser import HTMLParser
+from typing import List, Optional
+
+from bs4 import BeautifulSoup
+
+MAX_CONTENT_CHARS = 5000
+# Decoded chunk size when feeding the paragraph collector
+CHUNK_SIZE = 16384
+# Paragraphs used when no article container is found
+FALLBACK_PARAGRAPHS = 15
+ARTICLE_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+CONTENT_SELECTORS = [
+    'article',
+    '[class*="article-content"]',
+    '[class*="post-content"]',
+    '[class*="entry-content"]',
+    '[class*="story-body"]',
+    'main'
+]
+
+SKIP_TAGS = {'script', 'style', 'nav', 'footer', 'aside', 'header', 'noscript', 'template'}
+CONTAINER_TAGS = {'article', 'main'}
+CONTAINER_CLASSES = ('article-content', 'post-content', 'entry-content', 'story-body')
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr'
+}
+
+
+def is_html_content_type(content_type: Optional[str]) -> bool:
+    """True for HTML responses, or when the server sent no Content-Type at all"""
+    if not content_type:
+        return True
+    return content_type.split(';')[0].strip().lower() in ARTICLE_CONTENT_TYPES
+
+
+def incremental_decoder(encoding: Optional[str]):
+    """Incremental decoder for encoding, falling back to UTF-8 for unknown names"""
+    try:
+        return codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+    except LookupError:
+        return codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+
+class ParagraphCollector(HTMLParser):
+    """Incremental <p> text collector for streamed article HTML
+
+    Feed it decoded chunks as they arrive. Paragraphs inside an article container
+    (``<article>``, ``<main>`` or a content-like class) are kept apart from the
+    rest. Script, style and page-chrome elements are skipped. ``done`` turns True
+    once enough container text has been collected, so the caller can stop
+    downloading.
+    """
+
+    def __init__(self, max_chars: int = MAX_CONTENT_CHARS):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.container_paragraphs: List[str] = []
+        self.other_paragraphs: List[str] = []
+        self._container_chars = 0
+        # Open elements as (tag, is_container, is_skip)
+        self._stack = []
+        self._container_depth = 0
+        self._skip_depth = 0
+        self._paragraph: Optional[List[str]] = None
+        self._paragraph_in_container = False
+
+    @property
+    def done(self) -> bool:
+        return self._container_chars >= self.max_chars
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == 'br' and self._paragraph is not None:
+                self._paragraph.append(' ')
+            return
+        if tag == 'p':
+            self._close_paragraph()
+            self._pop_to('p')
+
+        css_class = dict(attrs).get('class') or ''
+        is_container = tag in CONTAINER_TAGS or any(name in css_class for name in CONTAINER_CLASSES)
+        is_skip = tag in SKIP_TAGS
+        self._stack.append((tag, is_container, is_skip))
+        self._container_depth += is_container
+        self._skip_depth += is_skip
+
+        if tag == 'p' and not self._skip_depth:
+            self._paragraph = []
+            self._paragraph_in_container = self._container_depth > 0
+
+    def handle_endtag(self, tag):
+        if tag == 'p':
+            self._close_paragraph()
+        self._pop_to(tag)
+
+    def handle_data(self, data):
+        if self._paragraph is not None and not self._skip_depth:
+            self._paragraph.append(data)
+
+    def close(self):
+        super().close()
+        self._close_paragraph()
+
+    def _pop_to(self, tag):
+        """Pop open elements up to and including tag (tolerates unclosed tags)"""
+        if not any(open_tag == tag for open_tag, _, _ in self._stack):
+            return
+        while self._stack:
+            open_tag, is_container, is_skip = self._stack.pop()
+            self._container_depth -= is_container
+            self._skip_depth -= is_skip
+            if open_tag == tag:
+                break
+
+    def _close_paragraph(self):
+        if self._paragraph is None:
+            return
+        text = ' '.join(''.join(self._paragraph).split())
+        self._paragraph = None
+        if not text:
+            return
+        if self._paragraph_in_container:
+            self.container_paragraphs.append(text)
+            self._container_chars += len(text) + 1
+        elif len(self.other_paragraphs) < FALLBACK_PARAGRAPHS:
+            self.other_paragraphs.append(text)
+
+    def text(self) -> str:
+        paragraphs = self.container_paragraphs or self.other_paragraphs
+        return ' '.join(paragraphs)[:self.max_chars]
+
+
+def extract_text_from_html(html: bytes, max_chars: int = MAX_CONTENT_CHARS) -> str:
+    """Extract main article text by building a full BeautifulSoup tree"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    for script in soup(['script', 'style', 'nav', 'footer', 'aside', 'header']):
+        script.decompose()
+
+    content = None
+    for selector in CONTENT_SELECTORS:
+        content = soup.select_one(selector)
+        if content:
+            break
+
+    if content:
+        paragraphs = content.find_all('p')
+        text = ' '.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
+        if text:
+            return text[:max_chars]
+
+    paragraphs = soup.find_all('p')
+    text = ' '.join([p.get_text(strip=True) for p in paragraphs[:FALLBACK_PARAGRAPHS] if p.get_text(strip=True)])
+    return text[:max_chars] if text else ""
+
+
+def extract_text_from_bytes(body: bytes, encoding: Optional[str] = None, max_chars: int = MAX_CONTENT_CHARS) -> str:
+    """Run the paragraph collector over a fully downloaded page
+
+    Module-level and bytes-in/text-out so it can run in a worker process.
+    """
+    decoder = incremental_decoder(encoding)
+    collector = ParagraphCollector(max_chars)
+    for start in range(0, len(body), CHUNK_SIZE):
+        collector.feed(decoder.decode(body[start:start + CHUNK_SIZE]))
+        if collector.done:
+            break
+    else:
+        collector.feed(decoder.decode(b'', final=True))
+    collector.close()
+    return collector.text()
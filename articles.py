@@ -0,0 +1,57 @@
+import sys
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+class Article:
+    """A discovered news article
+
+    Slotted and compact: ``published`` is an epoch timestamp (``date`` is derived
+    on demand), score/comments are ints and source names are interned, so a
+    session holding thousands of articles shares one string per source. Pickles
+    as a plain tuple of field values.
+    """
+
+    __slots__ = ("title", "url", "source", "published", "score", "comments",
+                 "discussion_url", "sources", "rank_score")
+
+    def __init__(self, title: str, url: str, source: str, published: int = 0, score: int = 0,
+                 comments: int = 0, discussion_url: Optional[str] = None,
+                 sources: Tuple[str, ...] = (), rank_score: float = 0.0):
+        self.title = title
+        self.url = url
+        self.source = sys.intern(source or "")
+        self.published = int(published or 0)
+        self.score = int(score or 0)
+        self.comments = int(comments or 0)
+        self.discussion_url = discussion_url
+        # Every source that reported this story (set by deduplication); defaults to (source,)
+        self.sources = tuple(sys.intern(name) for name in sources) or (self.source,)
+        self.rank_score = rank_score
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    @property
+    def date(self) -> str:
+        """Publication day as shown in the UI"""
+        return datetime.fromtimestamp(self.published).strftime('%Y-%m-%d')
+
+    def replace(self, **changes) -> "Article":
+        values = dict(zip(self.__slots__, self._values()))
+        values.update(changes)
+        return Article(**values)
+
+    def __eq__(self, other):
+        if other.__class__ is not Article:
+            return NotImplemented
+        return self._values() == other._values()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(self.__slots__, self._values()))
+        return f"Article({fields})"
+
+    def __reduce__(self):
+        return (Article, self._values())
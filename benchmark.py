@@ -0,0 +1,204 @@
+"""Offline benchmarks for news scraping and article extraction
+
+Record fixtures once (needs network), then benchmark against them offline:
+
+    python benchmark.py record --fixtures fixtures --articles 20
+    python benchmark.py run --fixtures fixtures --output results.json
+    python benchmark.py run --fixtures fixtures --baseline results.json
+
+``run`` reports per-source parse time, extract_article_content throughput and
+peak Python memory. With ``--baseline`` it exits non-zero when any metric is
+worse than the baseline by more than ``--tolerance``.
+"""
+import argparse
+import json
+import logging
+import math
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List
+
+from articles import Article
+from http_fixtures import DEFAULT_FIXTURES_DIR, RECORD, REPLAY
+from keyword_matcher import KeywordMatcher
+from news_scraper import NewsScraperModule
+from tracing import tracer
+
+MANIFEST = "manifest.json"
+
+# Metric name suffix -> True if bigger is better
+HIGHER_IS_BETTER = {"pages_per_s": True, "median_s": False, "peak_kib": False}
+
+
+def build_scraper(mode: str, fixtures_dir: Path, cache_dir: str) -> NewsScraperModule:
+    """A scraper with every cache off, so each run does the full fetch-and-parse work"""
+    return NewsScraperModule(
+        fixture_mode=mode,
+        fixtures_dir=fixtures_dir,
+        cache_dir=cache_dir,
+        use_http_cache=False,
+        use_hn_item_store=False,
+        use_article_cache=False,
+        use_news_index=False,
+        retries=0
+    )
+
+
+def record(fixtures_dir: Path, days: int, article_count: int):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        scraper = build_scraper(RECORD, fixtures_dir, cache_dir)
+        matcher = KeywordMatcher.from_string("")
+        counts: Dict[str, int] = {}
+        articles: List[Article] = []
+
+        for name in scraper.available_sources():
+            found, elapsed, error = scraper._run_source(name, matcher, days)
+            if error:
+                print(f"[BENCH] {name} failed while recording: {error}")
+            counts[name] = len(found)
+            articles.extend(found)
+            print(f"[BENCH] Recorded {name}: {len(found)} articles in {elapsed:.2f}s")
+
+        urls = []
+        for article in sorted(articles, key=lambda a: a.score, reverse=True):
+            if len(urls) >= article_count:
+                break
+            if article.url in urls:
+                continue
+            if scraper.extract_article_content(article.url, stream=False):
+                urls.append(article.url)
+        print(f"[BENCH] Recorded {len(urls)} article pages")
+
+        manifest = {
+            "recorded_at": int(time.time()),
+            "days": days,
+            "sources": counts,
+            "feeds": [asdict(feed) for feed in scraper.registry.feeds],
+            "articles": urls
+        }
+        (fixtures_dir / MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+
+def _peak_kib(fn) -> float:
+    """Peak traced Python allocation while running fn, in KiB"""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def run(fixtures_dir: Path, repeat: int) -> Dict[str, float]:
+    manifest = json.loads((fixtures_dir / MANIFEST).read_text(encoding="utf-8"))
+    results: Dict[str, float] = {}
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        scraper = build_scraper(REPLAY, fixtures_dir, cache_dir)
+        for feed in manifest.get("feeds", []):
+            scraper.registry.add_feed(**feed)
+        matcher = KeywordMatcher.from_string("")
+        # Widen the timeframe by the fixtures' age so replayed items are not dropped as old
+        days = manifest["days"] + math.ceil((time.time() - manifest["recorded_at"]) / 86400)
+
+        for name in manifest["sources"]:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                articles, _, error = scraper._run_source(name, matcher, days)
+                timings.append(time.perf_counter() - start)
+            if error:
+                print(f"[BENCH] {name} failed on replay: {error}")
+                continue
+            key = f"source.{name}"
+            results[f"{key}.median_s"] = round(statistics.median(timings), 5)
+            results[f"{key}.articles"] = len(articles)
+            results[f"{key}.peak_kib"] = _peak_kib(lambda: scraper._run_source(name, matcher, days))
+
+        urls = manifest["articles"]
+        if urls:
+            for stream in (True, False):
+                key = f"extract.{'stream' if stream else 'full'}"
+                extract_all = lambda: [scraper.extract_article_content(url, stream=stream) for url in urls]
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    extract_all()
+                    timings.append(time.perf_counter() - start)
+                results[f"{key}.pages_per_s"] = round(len(urls) / statistics.median(timings), 2)
+                results[f"{key}.peak_kib"] = _peak_kib(extract_all)
+
+            # Bulk mode: I/O threads download, the process pool parses
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                scraper.extract_articles(urls)
+                timings.append(time.perf_counter() - start)
+            results["extract.bulk.pages_per_s"] = round(len(urls) / statistics.median(timings), 2)
+
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[str]:
+    """Metrics that regressed by more than tolerance (a fraction) against the baseline"""
+    regressions = []
+    for key, value in results.items():
+        suffix = key.rsplit(".", 1)[-1]
+        old = baseline.get(key)
+        if suffix not in HIGHER_IS_BETTER or not old:
+            continue
+        change = (value - old) / old
+        if HIGHER_IS_BETTER[suffix]:
+            change = -change
+        if change > tolerance:
+            regressions.append(f"{key}: {old} -> {value} ({change:+.0%})")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["record", "run"])
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES_DIR, help="fixture directory")
+    parser.add_argument("--days", type=int, default=7, help="timeframe used when recording")
+    parser.add_argument("--articles", type=int, default=20, help="article pages to record")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per measurement")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="fail on regressions against this results file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed regression (fraction)")
+    parser.add_argument("--verbose", action="store_true", help="show scraper diagnostics")
+    args = parser.parse_args(argv)
+
+    args.fixtures.mkdir(parents=True, exist_ok=True)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    # Spans are still created (their cost is part of the hot path) but not written to the trace file
+    tracer.path = None
+
+    if args.command == "record":
+        record(args.fixtures, args.days, args.articles)
+        print(f"Fixtures written to {args.fixtures}")
+        return 0
+
+    results = run(args.fixtures, args.repeat)
+    width = max((len(key) for key in results), default=0)
+    for key, value in results.items():
+        print(f"{key:<{width}}  {value}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
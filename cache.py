@@ -0,0 +1,332 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# Root for every on-disk cache; override with POST_GENERATOR_CACHE_DIR
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("POST_GENERATOR_CACHE_DIR", Path.home() / ".cache" / "post-generator")
+)
+
+
+def _atomic_write(path: Path, data: bytes):
+    """Write bytes to path via a temp file so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+@dataclass
+class CachedResponse:
+    """A stored response body with its HTTP validators"""
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+
+class HTTPCache:
+    """On-disk HTTP cache for conditional requests (ETag / Last-Modified)
+
+    Each URL maps to a ``<sha256>.json`` metadata file and a ``<sha256>.body`` file.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR) / "http"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Return the cached response for url, or None if absent or unreadable"""
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+
+        return CachedResponse(
+            body=body,
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+            stored_at=meta.get("stored_at", 0)
+        )
+
+    def store(self, url: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Persist a 200 response body and its validators"""
+        meta_path, body_path = self._paths(url)
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time()
+        }
+        with self._lock:
+            _atomic_write(body_path, body)
+            _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def touch(self, url: str):
+        """Mark a cached entry as fresh again (after a 304 Not Modified)"""
+        meta_path, _ = self._paths(url)
+        with self._lock:
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                return
+            meta["stored_at"] = time.time()
+            _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+
+class HNItemStore:
+    """SQLite store of Hacker News items keyed by story id
+
+    ``title``, ``url``, ``time`` and ``type`` are written once and kept; only the
+    volatile ``score`` and ``descendants`` fields are overwritten on refresh.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        root = Path(cache_dir or DEFAULT_CACHE_DIR)
+        root.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(root / "hn_items.sqlite3", check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS hn_items (
+                    id INTEGER PRIMARY KEY,
+                    title TEXT,
+                    url TEXT,
+                    time INTEGER,
+                    type TEXT,
+                    score INTEGER,
+                    descendants INTEGER,
+                    refreshed_at REAL
+                )"""
+            )
+
+    def get_many(self, ids: Iterable[int]) -> Dict[int, Dict]:
+        """Return stored items (HN API field names plus ``refreshed_at``) by id"""
+        ids = list(ids)
+        if not ids:
+            return {}
+
+        items = {}
+        with self._lock:
+            # Stay well under SQLite's host-parameter limit
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT id, title, url, time, type, score, descendants, refreshed_at "
+                    f"FROM hn_items WHERE id IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for row in rows:
+                    item = dict(zip(
+                        ("id", "title", "url", "time", "type", "score", "descendants", "refreshed_at"),
+                        row
+                    ))
+                    if item["url"] is None:
+                        del item["url"]
+                    items[item["id"]] = item
+        return items
+
+    def upsert_many(self, items: List[Dict]):
+        """Insert new items, or refresh score/descendants of known ones"""
+        now = time.time()
+        rows = [
+            (
+                item["id"], item.get("title"), item.get("url"), item.get("time", 0),
+                item.get("type"), item.get("score", 0), item.get("descendants", 0), now
+            )
+            for item in items if item and "id" in item
+        ]
+        if not rows:
+            return
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """INSERT INTO hn_items (id, title, url, time, type, score, descendants, refreshed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    score = excluded.score,
+                    descendants = excluded.descendants,
+                    refreshed_at = excluded.refreshed_at""",
+                rows
+            )
+
+
+class ArticleContentCache:
+    """SQLite store of extracted article text keyed by canonical URL
+
+    Entries expire after ``ttl`` seconds. Once the stored text exceeds
+    ``max_bytes``, the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, ttl: float = 7 * 86400,
+                 max_bytes: int = 50 * 1024 * 1024):
+        root = Path(cache_dir or DEFAULT_CACHE_DIR)
+        root.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._conn = sqlite3.connect(root / "articles.sqlite3", check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS article_content (
+                    url TEXT PRIMARY KEY,
+                    content TEXT,
+                    content_hash TEXT,
+                    size INTEGER,
+                    fetched_at REAL,
+                    accessed_at REAL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_article_content_accessed ON article_content (accessed_at)"
+            )
+
+    def get(self, url: str) -> Optional[str]:
+        """Return cached text for a canonical URL, or None if missing or expired"""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT content, fetched_at FROM article_content WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM article_content WHERE url = ?", (url,))
+                return None
+            self._conn.execute("UPDATE article_content SET accessed_at = ? WHERE url = ?", (now, url))
+            return row[0]
+
+    def put(self, url: str, content: str):
+        """Store extracted text and evict least recently used entries over the size cap"""
+        now = time.time()
+        data = content.encode("utf-8")
+        with self._lock, self._conn:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO article_content
+                (url, content, content_hash, size, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?)""",
+                (url, content, hashlib.sha256(data).hexdigest(), len(data), now, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM article_content").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        expired_before = time.time() - self.ttl
+        self._conn.execute("DELETE FROM article_content WHERE fetched_at < ?", (expired_before,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM article_content").fetchone()[0]
+
+        for url, size in self._conn.execute(
+            "SELECT url, size FROM article_content ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM article_content WHERE url = ?", (url,))
+            total -= size
+
+
+class AnalysisCache:
+    """LLM content analyses keyed by content hash, provider, model and prompt version
+
+    A small in-memory LRU sits in front of a SQLite table, so repeat lookups in
+    one process never touch disk and results survive restarts. Disk entries
+    expire after ``ttl`` seconds.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, ttl: float = 30 * 86400, memory_entries: int = 256):
+        root = Path(cache_dir or DEFAULT_CACHE_DIR)
+        root.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._conn = sqlite3.connect(root / "analyses.sqlite3", check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS analyses (
+                    key TEXT PRIMARY KEY,
+                    provider TEXT,
+                    model TEXT,
+                    prompt_version TEXT,
+                    analysis TEXT,
+                    created_at REAL
+                )"""
+            )
+
+    @staticmethod
+    def key(content: str, provider: str, model: str, prompt_version) -> str:
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        return hashlib.sha256(
+            "\0".join((content_hash, provider, model, str(prompt_version))).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a copy of the cached analysis, or None if missing or expired"""
+        with self._lock:
+            analysis = self._memory.get(key)
+            if analysis is not None:
+                self._memory.move_to_end(key)
+                return json.loads(json.dumps(analysis))
+
+            with self._conn:
+                row = self._conn.execute(
+                    "SELECT analysis, created_at FROM analyses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if time.time() - row[1] > self.ttl:
+                    self._conn.execute("DELETE FROM analyses WHERE key = ?", (key,))
+                    return None
+            try:
+                analysis = json.loads(row[0])
+            except ValueError:
+                return None
+            self._remember(key, analysis)
+            return json.loads(row[0])
+
+    def put(self, key: str, analysis: Dict, provider: str = "", model: str = "", prompt_version=""):
+        data = json.dumps(analysis)
+        with self._lock:
+            self._remember(key, json.loads(data))
+            with self._conn:
+                self._conn.execute(
+                    """INSERT OR REPLACE INTO analyses
+                    (key, provider, model, prompt_version, analysis, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)""",
+                    (key, provider, model, str(prompt_version), data, time.time())
+                )
+
+    def _remember(self, key: str, analysis: Dict):
+        self._memory[key] = analysis
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
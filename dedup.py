@@ -0,0 +1,158 @@
+import hashlib
+import re
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+from articles import Article
+from urls import canonicalize_url
+
+# Near-duplicate titles: SimHash fingerprints within this many differing bits
+MAX_TITLE_DISTANCE = 3
+# Fingerprint split into BANDS equal slices; with a distance of at most BANDS - 1
+# two near-duplicates always share one identical slice (pigeonhole), so only
+# articles in a common bucket are ever compared.
+BANDS = 4
+BAND_BITS = 64 // BANDS
+MIN_TITLE_TOKENS = 3
+
+DISCUSSION_HOSTS = ("news.ycombinator.com", "reddit.com", "old.reddit.com")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in", "is",
+    "it", "its", "of", "on", "or", "that", "the", "to", "with"
+}
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _title_tokens(title: str) -> List[str]:
+    return [w for w in _WORD_RE.findall((title or "").lower()) if w not in STOPWORDS]
+
+
+def title_simhash(tokens: List[str]) -> int:
+    """64-bit SimHash over word unigrams and bigrams"""
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    weights = [0] * 64
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def _is_discussion_url(url: str) -> bool:
+    host = (urlsplit(url).hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host in DISCUSSION_HOSTS
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def deduplicate_articles(articles: List[Article], max_distance: int = MAX_TITLE_DISTANCE) -> List[Article]:
+    """Merge articles that point at the same story
+
+    Two articles are duplicates when their canonical URLs match (Hacker News item
+    links resolve to the story they discuss) or their titles are near-duplicates
+    by SimHash. Each group becomes one record built from its highest-scoring
+    member, with summed ``score``/``comments`` and a ``sources`` list. Runs in
+    roughly linear time: titles are only compared within shared SimHash buckets.
+    """
+    if len(articles) < 2:
+        return list(articles)
+
+    max_distance = min(max_distance, BANDS - 1)
+
+    # HN item link -> canonical URL of the story it discusses
+    hn_items = {}
+    for article in articles:
+        if article.discussion_url and article.url:
+            hn_items[canonicalize_url(article.discussion_url)] = canonicalize_url(article.url)
+
+    groups = _UnionFind(len(articles))
+    by_url: Dict[str, int] = {}
+    by_title: Dict[str, int] = {}
+    buckets: Dict[tuple, List[int]] = {}
+    fingerprints: List[int] = []
+
+    for i, article in enumerate(articles):
+        url_key = canonicalize_url(article.url)
+        url_key = hn_items.get(url_key, url_key)
+        if url_key:
+            if url_key in by_url:
+                groups.union(by_url[url_key], i)
+            else:
+                by_url[url_key] = i
+
+        tokens = _title_tokens(article.title)
+        if len(tokens) < MIN_TITLE_TOKENS:
+            # Short generic titles ("Help", "Question") only merge through the URL
+            fingerprints.append(-1)
+            continue
+
+        title_key = " ".join(tokens)
+        if title_key in by_title:
+            groups.union(by_title[title_key], i)
+        else:
+            by_title[title_key] = i
+
+        fingerprint = title_simhash(tokens)
+        fingerprints.append(fingerprint)
+        for band in range(BANDS):
+            key = (band, (fingerprint >> (band * BAND_BITS)) & ((1 << BAND_BITS) - 1))
+            for j in buckets.get(key, ()):
+                if bin(fingerprint ^ fingerprints[j]).count("1") <= max_distance:
+                    groups.union(j, i)
+            buckets.setdefault(key, []).append(i)
+
+    members: Dict[int, List[int]] = {}
+    for i in range(len(articles)):
+        members.setdefault(groups.find(i), []).append(i)
+
+    merged = []
+    for indices in members.values():
+        if len(indices) == 1:
+            merged.append(articles[indices[0]])
+            continue
+
+        group = sorted((articles[i] for i in indices), key=lambda a: a.score, reverse=True)
+        url = group[0].url
+        # Prefer the original story over an HN/Reddit discussion link
+        for article in group:
+            if article.url and not _is_discussion_url(article.url):
+                url = article.url
+                break
+
+        sources = []
+        for article in group:
+            for source in article.sources:
+                if source not in sources:
+                    sources.append(source)
+
+        merged.append(group[0].replace(
+            url=url,
+            score=sum(a.score for a in group),
+            comments=sum(a.comments for a in group),
+            sources=tuple(sources)
+        ))
+
+    return merged
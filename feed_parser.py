@@ -0,0 +1,90 @@
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import BinaryIO, Dict, Iterator, Optional
+
+from lxml import etree
+
+# RSS <item> and Atom <entry>, in any namespace
+ITEM_TAGS = ("{*}item", "{*}entry")
+DATE_TAGS = ("pubDate", "published", "updated", "date")
+
+
+def _localname(tag) -> str:
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def parse_feed_date(value: str) -> Optional[int]:
+    """Parse an RFC 822 (RSS) or ISO 8601 (Atom) date into an epoch timestamp"""
+    value = (value or "").strip()
+    if not value:
+        return None
+
+    try:
+        return int(parsedate_to_datetime(value).timestamp())
+    except (TypeError, ValueError, IndexError):
+        pass
+
+    try:
+        return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return None
+
+
+def _read_item(elem) -> Optional[Dict]:
+    """Pull title, link and publish time out of one <item>/<entry> element"""
+    title = link = None
+    published = None
+
+    for child in elem:
+        name = _localname(child.tag)
+        if name == "title" and title is None:
+            title = "".join(child.itertext()).strip()
+        elif name == "link":
+            # RSS puts the URL in the text, Atom in href (prefer rel="alternate")
+            href = child.get("href")
+            if href:
+                if link is None or child.get("rel", "alternate") == "alternate":
+                    link = href.strip()
+            elif child.text and link is None:
+                link = child.text.strip()
+        elif name in DATE_TAGS and published is None:
+            published = parse_feed_date(child.text)
+
+    if not title or not link:
+        return None
+
+    return {"title": title, "link": link, "published": published}
+
+
+def iter_feed_items(source: BinaryIO, limit: Optional[int] = None,
+                    cutoff_ts: Optional[int] = None) -> Iterator[Dict]:
+    """Incrementally yield items from an RSS or Atom feed
+
+    Items are parsed one element at a time and discarded once read, so memory stays
+    flat regardless of feed size. Parsing stops after ``limit`` items, or at the first
+    item older than ``cutoff_ts`` (feeds are newest first). Items without a date are
+    always yielded with ``published`` set to None.
+    """
+    count = 0
+    context = etree.iterparse(source, events=("end",), tag=ITEM_TAGS, recover=True)
+
+    for _, elem in context:
+        item = _read_item(elem)
+
+        # Free the parsed element and everything before it
+        elem.clear()
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+
+        if item is None:
+            continue
+
+        if cutoff_ts is not None and item["published"] is not None and item["published"] < cutoff_ts:
+            break
+
+        yield item
+        count += 1
+        if limit and count >= limit:
+            break
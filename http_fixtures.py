@@ -0,0 +1,114 @@
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from cache import _atomic_write
+
+RECORD = "record"
+REPLAY = "replay"
+MODES = (RECORD, REPLAY)
+
+# Default location for recorded fixtures; override with POST_GENERATOR_FIXTURES_DIR
+DEFAULT_FIXTURES_DIR = Path(os.environ.get("POST_GENERATOR_FIXTURES_DIR", "fixtures"))
+
+# Only these response headers are kept; the scraper never looks at the rest
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class FixtureMissing(requests.exceptions.ConnectionError):
+    """Raised in replay mode for a request that was never recorded"""
+
+
+class FixtureStore:
+    """Recorded HTTP responses on disk, keyed by method and URL
+
+    Each response is a ``<sha256>.json`` metadata file (URL, status, headers) and a
+    ``<sha256>.body`` file holding the raw bytes, the same layout as HTTPCache.
+    """
+
+    def __init__(self, fixtures_dir: Optional[Path] = None):
+        self.fixtures_dir = Path(fixtures_dir or DEFAULT_FIXTURES_DIR)
+        self.fixtures_dir.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, method: str, url: str):
+        key = hashlib.sha256(f"{method.upper()} {url}".encode("utf-8")).hexdigest()
+        return self.fixtures_dir / f"{key}.json", self.fixtures_dir / f"{key}.body"
+
+    def load(self, method: str, url: str) -> Optional[Dict]:
+        meta_path, body_path = self._paths(method, url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            meta["body"] = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        return meta
+
+    def save(self, method: str, url: str, status: int, headers: Dict[str, str], body: bytes):
+        meta_path, body_path = self._paths(method, url)
+        meta = {
+            "method": method.upper(),
+            "url": url,
+            "status": status,
+            "headers": {name: headers[name] for name in KEPT_HEADERS if name in headers}
+        }
+        _atomic_write(body_path, body)
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def urls(self) -> List[str]:
+        """Every recorded URL"""
+        urls = []
+        for meta_path in sorted(self.fixtures_dir.glob("*.json")):
+            try:
+                urls.append(json.loads(meta_path.read_text(encoding="utf-8"))["url"])
+            except (OSError, ValueError, KeyError):
+                continue
+        return urls
+
+
+class FixtureAdapter(HTTPAdapter):
+    """Transport adapter that records live responses or replays recorded ones
+
+    Mounted on a session in place of the normal HTTPAdapter, so everything above
+    the transport (timeouts, health tracking, caching, streaming extraction) runs
+    unchanged. In replay mode no socket is ever opened; an unrecorded URL raises
+    FixtureMissing, which callers see as a connection error.
+    """
+
+    def __init__(self, store: FixtureStore, mode: str = REPLAY, **kwargs):
+        if mode not in MODES:
+            raise ValueError(f"Unknown fixture mode: {mode}")
+        super().__init__(**kwargs)
+        self.store = store
+        self.mode = mode
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        if self.mode == REPLAY:
+            fixture = self.store.load(request.method, request.url)
+            if fixture is None:
+                raise FixtureMissing(f"No recorded fixture for {request.method} {request.url}", request=request)
+            return self._build_replay(request, fixture)
+
+        response = super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        # Reading .content consumes the stream; later iter_content calls replay it from memory
+        self.store.save(request.method, request.url, response.status_code, response.headers, response.content)
+        return response
+
+    def _build_replay(self, request, fixture: Dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = fixture["status"]
+        response.headers = CaseInsensitiveDict(fixture.get("headers") or {})
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(fixture["body"])
+        response.url = request.url
+        response.request = request
+        response.reason = "Replayed"
+        response.connection = self
+        return response
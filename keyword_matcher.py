@@ -0,0 +1,72 @@
+import re
+from typing import Iterable, List, Optional, Union
+
+_END = ""
+
+
+def _normalize(keyword: str) -> str:
+    """Lowercase and collapse internal whitespace so phrases compare consistently"""
+    return " ".join(keyword.lower().split())
+
+
+def _trie_pattern(node: dict) -> Optional[str]:
+    """Turn a character trie into a regex that shares common prefixes"""
+    branches = []
+    for ch in sorted(k for k in node if k != _END):
+        atom = r"\s+" if ch == " " else re.escape(ch)
+        branches.append(atom + (_trie_pattern(node[ch]) or ""))
+
+    if not branches:
+        return None
+
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if _END in node:
+        body = "(?:" + body + ")?"
+    return body
+
+
+class KeywordMatcher:
+    """Compiled matcher for a list of tracked keywords and phrases
+
+    All keywords are folded into one case-insensitive regex built from a prefix
+    trie, so a title is scanned once no matter how many keywords are tracked.
+    Matches respect word boundaries ("ai" does not match "said") and phrases
+    match across any run of whitespace. An empty matcher matches everything.
+    """
+
+    def __init__(self, keywords: Iterable[str] = ()):
+        self.keywords: List[str] = sorted({_normalize(k) for k in keywords if k and k.strip()})
+        self._regex = None
+
+        if self.keywords:
+            trie: dict = {}
+            for keyword in self.keywords:
+                node = trie
+                for ch in keyword:
+                    node = node.setdefault(ch, {})
+                node[_END] = {}
+            self._regex = re.compile(rf"(?<!\w){_trie_pattern(trie)}(?!\w)", re.IGNORECASE)
+
+    @classmethod
+    def from_string(cls, keywords: str) -> "KeywordMatcher":
+        """Build a matcher from comma-separated user input"""
+        return cls((keywords or "").split(","))
+
+    @classmethod
+    def coerce(cls, keywords: Union["KeywordMatcher", Iterable[str], None]) -> "KeywordMatcher":
+        """Accept an existing matcher or a plain keyword list"""
+        if isinstance(keywords, cls):
+            return keywords
+        return cls(keywords or ())
+
+    def __bool__(self) -> bool:
+        return bool(self.keywords)
+
+    def __repr__(self) -> str:
+        return f"KeywordMatcher({self.keywords!r})"
+
+    def matches(self, text: str) -> bool:
+        """True if text contains any keyword (always True when no keywords are set)"""
+        if self._regex is None:
+            return True
+        return self._regex.search(text or "") is not None
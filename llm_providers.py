@@ -0,0 +1,362 @@
+import asyncio
+import concurrent.futures
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import google.generativeai as genai
+import openai
+
+from tracing import span
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Most requests in flight at once per provider, across every session
+PROVIDER_CONCURRENCY: Dict[str, int] = {"openai": 4, "openrouter": 4, "gemini": 2}
+DEFAULT_CONCURRENCY = 2
+
+
+@dataclass
+class Completion:
+    """Text of one completion plus token usage when the provider reports it
+
+    ``choices`` holds every returned candidate when more than one was requested
+    (``n > 1``); ``text`` is always the first.
+    """
+    text: str
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    choices: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.choices:
+            self.choices = [self.text]
+
+
+class _LoopThread:
+    """A process-wide asyncio loop on a daemon thread
+
+    Async clients keep connection pools bound to the loop they first ran on, so
+    every coroutine - from any Streamlit session - runs on this one loop.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="llm-loop", daemon=True).start()
+            return self._loop
+
+    def submit(self, coro: Awaitable) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable):
+        return self.submit(coro).result()
+
+
+_loop_thread = _LoopThread()
+
+
+def run_sync(coro: Awaitable):
+    """Run a coroutine on the shared LLM loop and wait for its result"""
+    return _loop_thread.run(coro)
+
+
+def as_completed_sync(coros: Iterable[Awaitable]) -> Iterator:
+    """Run coroutines concurrently on the shared LLM loop, yielding each result as it finishes
+
+    Exceptions are yielded in place of results rather than raised.
+    """
+    futures = [_loop_thread.submit(coro) for coro in coros]
+    for future in concurrent.futures.as_completed(futures):
+        error = future.exception()
+        yield error if error is not None else future.result()
+
+
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def _provider_semaphore(name: str) -> asyncio.Semaphore:
+    # Only ever called on the loop thread, so no lock is needed
+    if name not in _semaphores:
+        _semaphores[name] = asyncio.Semaphore(PROVIDER_CONCURRENCY.get(name, DEFAULT_CONCURRENCY))
+    return _semaphores[name]
+
+
+class LLMProvider:
+    """One chat model behind a provider-neutral interface
+
+    Subclasses implement ``_acomplete``. ``acomplete`` wraps it in the provider's
+    concurrency cap (PROVIDER_CONCURRENCY) and ``complete`` is the blocking
+    wrapper of that, so the sync and async APIs always behave the same.
+    """
+
+    name = "base"
+    # True if one request can return several candidates (the ``n`` argument)
+    supports_n = False
+
+    def __init__(self, model: str):
+        self.model = model
+
+    async def acomplete(self, prompt: str, system: Optional[str] = None, temperature: float = 0.7,
+                        max_tokens: Optional[int] = None, json_mode: bool = False, n: int = 1) -> Completion:
+        if n > 1 and not self.supports_n:
+            raise ValueError(f"{self.name} does not support n > 1")
+        async with _provider_semaphore(self.name):
+            return await self._acomplete(prompt, system, temperature, max_tokens, json_mode, n)
+
+    async def _acomplete(self, prompt: str, system: Optional[str], temperature: float,
+                         max_tokens: Optional[int], json_mode: bool, n: int) -> Completion:
+        raise NotImplementedError
+
+    def complete(self, prompt: str, system: Optional[str] = None, temperature: float = 0.7,
+                 max_tokens: Optional[int] = None, json_mode: bool = False, n: int = 1) -> Completion:
+        return run_sync(self.acomplete(prompt, system, temperature, max_tokens, json_mode, n))
+
+    async def aclose(self):
+        """Release the provider's connections"""
+
+    def close(self):
+        run_sync(self.aclose())
+
+    async def _astream(self, prompt: str, system: Optional[str], temperature: float,
+                       max_tokens: Optional[int], completion: Completion) -> AsyncIterator[str]:
+        """Yield text deltas and fill in ``completion``'s token usage
+
+        The default yields the whole completion as one delta, for providers
+        without streaming.
+        """
+        result = await self._acomplete(prompt, system, temperature, max_tokens, False, 1)
+        completion.prompt_tokens = result.prompt_tokens
+        completion.completion_tokens = result.completion_tokens
+        yield result.text
+
+    def stream(self, prompt: str, system: Optional[str] = None, temperature: float = 0.7,
+               max_tokens: Optional[int] = None, span_name: str = "llm.stream", **span_attrs) -> "CompletionStream":
+        """Stream a completion to a sync caller; iterate the result for text deltas"""
+        return CompletionStream(self, prompt, system, temperature, max_tokens, span_name, span_attrs)
+
+
+class OpenAIProvider(LLMProvider):
+    """OpenAI chat completions; also serves OpenRouter through its compatible API
+
+    OpenRouter routes to backends that may ignore ``n``, so it is only enabled
+    for OpenAI itself.
+    """
+
+    name = "openai"
+    supports_n = True
+
+    def __init__(self, api_key: str, model: str, base_url: Optional[str] = None, name: Optional[str] = None):
+        super().__init__(model)
+        if name:
+            self.name = name
+        if base_url:
+            self.supports_n = False
+        self.client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url)
+
+    async def aclose(self):
+        await self.client.close()
+
+    def _request(self, prompt: str, system: Optional[str], temperature: float,
+                 max_tokens: Optional[int], json_mode: bool, n: int = 1) -> dict:
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": prompt})
+        request = dict(model=self.model, messages=messages, temperature=temperature)
+        if max_tokens:
+            request["max_tokens"] = max_tokens
+        if json_mode:
+            request["response_format"] = {"type": "json_object"}
+        if n > 1:
+            request["n"] = n
+        return request
+
+    async def _acomplete(self, prompt: str, system: Optional[str], temperature: float,
+                         max_tokens: Optional[int], json_mode: bool, n: int) -> Completion:
+        response = await self.client.chat.completions.create(
+            **self._request(prompt, system, temperature, max_tokens, json_mode, n)
+        )
+        usage = response.usage
+        choices = [choice.message.content or "" for choice in response.choices]
+        return Completion(
+            text=choices[0] if choices else "",
+            prompt_tokens=usage.prompt_tokens if usage else None,
+            completion_tokens=usage.completion_tokens if usage else None,
+            choices=choices
+        )
+
+    async def _astream(self, prompt: str, system: Optional[str], temperature: float,
+                       max_tokens: Optional[int], completion: Completion) -> AsyncIterator[str]:
+        request = self._request(prompt, system, temperature, max_tokens, False)
+        request["stream"] = True
+        # Through extra_body: SDKs older than the stream_options argument still send it
+        request["extra_body"] = {"stream_options": {"include_usage": True}}
+        async for chunk in await self.client.chat.completions.create(**request):
+            if chunk.usage:
+                completion.prompt_tokens = chunk.usage.prompt_tokens
+                completion.completion_tokens = chunk.usage.completion_tokens
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini through google-generativeai's async generation"""
+
+    name = "gemini"
+
+    def __init__(self, api_key: str, model: str):
+        super().__init__(model)
+        genai.configure(api_key=api_key)
+        self.client = genai.GenerativeModel(model)
+
+    async def _acomplete(self, prompt: str, system: Optional[str], temperature: float,
+                         max_tokens: Optional[int], json_mode: bool, n: int) -> Completion:
+        # json_mode relies on the prompt asking for JSON; callers strip code fences
+        if system:
+            prompt = f"{system}\n\n{prompt}"
+        config = genai.GenerationConfig(temperature=temperature, max_output_tokens=max_tokens)
+        response = await self.client.generate_content_async(prompt, generation_config=config)
+        usage = getattr(response, "usage_metadata", None)
+        return Completion(
+            text=response.text,
+            prompt_tokens=usage.prompt_token_count if usage else None,
+            completion_tokens=usage.candidates_token_count if usage else None
+        )
+
+    async def _astream(self, prompt: str, system: Optional[str], temperature: float,
+                       max_tokens: Optional[int], completion: Completion) -> AsyncIterator[str]:
+        if system:
+            prompt = f"{system}\n\n{prompt}"
+        config = genai.GenerationConfig(temperature=temperature, max_output_tokens=max_tokens)
+        response = await self.client.generate_content_async(prompt, generation_config=config, stream=True)
+        async for chunk in response:
+            usage = getattr(chunk, "usage_metadata", None)
+            if usage:
+                completion.prompt_tokens = usage.prompt_token_count
+                completion.completion_tokens = usage.candidates_token_count
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. a final safety or finish-reason chunk)
+                continue
+            if text:
+                yield text
+
+
+class _StreamEnd:
+    """Queue marker for a finished stream, carrying its error if it failed"""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: Optional[BaseException]):
+        self.error = error
+
+
+class CompletionStream:
+    """A completion streamed from the shared LLM loop to a sync caller
+
+    Iterating yields text deltas as they arrive and raises the provider's error,
+    if any, at the end. Afterwards ``completion`` holds the full text and usage.
+    The stream holds its provider's concurrency slot while it runs and is traced
+    as one span that records time to first token.
+    """
+
+    def __init__(self, provider: LLMProvider, prompt: str, system: Optional[str], temperature: float,
+                 max_tokens: Optional[int], span_name: str, span_attrs: Dict):
+        self.provider = provider
+        self.prompt = prompt
+        self.system = system
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.span_name = span_name
+        self.span_attrs = span_attrs
+        self.completion = Completion(text="")
+        self.error: Optional[BaseException] = None
+        self._future: Optional[concurrent.futures.Future] = None
+
+    async def _pump(self, out: queue.Queue, tag):
+        error = None
+        parts = []
+        try:
+            with span(self.span_name, provider=self.provider.name, model=self.provider.model,
+                      **self.span_attrs) as stream_span:
+                async with _provider_semaphore(self.provider.name):
+                    start = time.perf_counter()
+                    async for delta in self.provider._astream(
+                        self.prompt, self.system, self.temperature, self.max_tokens, self.completion
+                    ):
+                        if not parts:
+                            stream_span.set(ttft_ms=round((time.perf_counter() - start) * 1000, 3))
+                        parts.append(delta)
+                        out.put((tag, delta))
+                stream_span.set(
+                    chunks=len(parts),
+                    response_chars=sum(map(len, parts)),
+                    prompt_tokens=self.completion.prompt_tokens,
+                    completion_tokens=self.completion.completion_tokens
+                )
+        except BaseException as e:
+            error = e
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            self.completion.text = "".join(parts)
+            self.completion.choices = [self.completion.text]
+            self.error = error
+            out.put((tag, _StreamEnd(error)))
+
+    def _start(self, out: queue.Queue, tag):
+        self._future = _loop_thread.submit(self._pump(out, tag))
+
+    def cancel(self):
+        if self._future is not None:
+            self._future.cancel()
+
+    def __iter__(self) -> Iterator[str]:
+        for _, delta in iter_streams([self]):
+            if delta is None:
+                if self.error is not None:
+                    raise self.error
+                return
+            yield delta
+
+
+def iter_streams(streams: List[CompletionStream]) -> Iterator[Tuple[int, Optional[str]]]:
+    """Run streams concurrently, yielding ``(index, delta)`` as text arrives
+
+    ``(index, None)`` marks the end of a stream; check its ``error`` then. Streams
+    still running when the caller stops iterating are cancelled.
+    """
+    out: queue.Queue = queue.Queue()
+    for index, stream in enumerate(streams):
+        stream._start(out, index)
+    remaining = len(streams)
+    try:
+        while remaining:
+            index, item = out.get()
+            if isinstance(item, _StreamEnd):
+                remaining -= 1
+                yield index, None
+            else:
+                yield index, item
+    finally:
+        for stream in streams:
+            stream.cancel()
+
+
+def create_provider(provider: str, api_key: str, model: str) -> LLMProvider:
+    """Build the provider for a UI provider label ("OpenAI", "Gemini" or "OpenRouter")"""
+    if provider == "OpenAI":
+        return OpenAIProvider(api_key, model)
+    if provider == "Gemini":
+        return GeminiProvider(api_key, model)
+    if provider == "OpenRouter":
+        return OpenAIProvider(api_key, model, base_url=OPENROUTER_BASE_URL, name="openrouter")
+    raise ValueError(f"Unknown API provider: {provider}")
@@ -0,0 +1,251 @@
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from articles import Article
+from cache import DEFAULT_CACHE_DIR
+from keyword_matcher import KeywordMatcher
+from tracing import span
+from urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_COLUMNS = ("title", "link", "source", "source_key", "score", "comments", "published", "discussion_url")
+
+
+def _fts_query(matcher: KeywordMatcher) -> str:
+    """OR of quoted FTS5 phrases, one per keyword"""
+    return " OR ".join('"' + keyword.replace('"', '""') + '"' for keyword in matcher.keywords)
+
+
+class NewsIndex:
+    """Local SQLite/FTS5 index of discovered articles
+
+    One row per (canonical URL, source); titles and extracted bodies are full-text
+    indexed. ``crawl_log`` records when each source was last pulled so callers can
+    tell whether the index is fresh enough to answer without going live.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        root = Path(cache_dir or DEFAULT_CACHE_DIR)
+        root.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(root / "news_index.sqlite3", check_same_thread=False, timeout=10)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            # WAL lets the background crawler write while sessions read
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS articles (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    link TEXT,
+                    title TEXT,
+                    source TEXT,
+                    source_key TEXT,
+                    score INTEGER,
+                    comments INTEGER,
+                    published INTEGER,
+                    discussion_url TEXT,
+                    body TEXT,
+                    indexed_at REAL,
+                    UNIQUE (url, source)
+                );
+                CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (source_key, published);
+
+                CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                    title, body, content='articles', content_rowid='id'
+                );
+                CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+                    INSERT INTO articles_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+                END;
+                CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+                    INSERT INTO articles_fts (articles_fts, rowid, title, body)
+                    VALUES ('delete', old.id, old.title, old.body);
+                END;
+                CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE ON articles BEGIN
+                    INSERT INTO articles_fts (articles_fts, rowid, title, body)
+                    VALUES ('delete', old.id, old.title, old.body);
+                    INSERT INTO articles_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+                END;
+
+                CREATE TABLE IF NOT EXISTS crawl_log (
+                    source_key TEXT PRIMARY KEY,
+                    crawled_at REAL
+                );
+                """
+            )
+
+    def upsert_articles(self, source_key: str, articles: List[Article]):
+        """Insert articles from one source, refreshing score/comments of known ones"""
+        now = time.time()
+        rows = [
+            (
+                canonicalize_url(article.url), article.url, article.title,
+                article.source or source_key, source_key, article.score,
+                article.comments, article.published or int(now),
+                article.discussion_url, now
+            )
+            for article in articles if article.url
+        ]
+        if not rows:
+            return
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """INSERT INTO articles
+                (url, link, title, source, source_key, score, comments, published, discussion_url, indexed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url, source) DO UPDATE SET
+                    score = excluded.score,
+                    comments = excluded.comments,
+                    indexed_at = excluded.indexed_at""",
+                rows
+            )
+
+    def set_body(self, url: str, body: str):
+        """Attach extracted article text to every row for this URL"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE articles SET body = ? WHERE url = ?", (body, canonicalize_url(url)))
+
+    def urls_without_body(self, source_keys: List[str], limit: int) -> List[str]:
+        """Most popular recently indexed links that have no extracted body yet"""
+        if not source_keys or limit <= 0:
+            return []
+        placeholders = ",".join("?" * len(source_keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"""SELECT link FROM articles
+                WHERE body IS NULL AND source_key IN ({placeholders})
+                ORDER BY indexed_at DESC, score DESC LIMIT ?""",
+                (*source_keys, limit)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def mark_crawled(self, source_key: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO crawl_log (source_key, crawled_at) VALUES (?, ?)",
+                (source_key, time.time())
+            )
+
+    def last_crawled(self, source_key: str) -> float:
+        """Epoch time of the last successful crawl of a source (0 if never)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT crawled_at FROM crawl_log WHERE source_key = ?", (source_key,)
+            ).fetchone()
+        return row[0] if row else 0.0
+
+    def search(self, matcher: KeywordMatcher, since_ts: int, source_keys: List[str], limit: int = 1000) -> List[Article]:
+        """Articles from the given sources published after since_ts that match the keywords
+
+        FTS5 narrows candidates over titles and bodies; the keyword matcher then
+        re-checks them so word-boundary and punctuation semantics match live scraping.
+        """
+        if not source_keys:
+            return []
+
+        placeholders = ",".join("?" * len(source_keys))
+        columns = ", ".join(f"a.{column}" for column in ARTICLE_COLUMNS)
+        params: list = [since_ts, *source_keys]
+
+        if matcher:
+            sql = (
+                f"SELECT {columns}, a.body FROM articles_fts f JOIN articles a ON a.id = f.rowid "
+                f"WHERE articles_fts MATCH ? AND a.published >= ? AND a.source_key IN ({placeholders}) "
+                f"ORDER BY a.published DESC LIMIT ?"
+            )
+            params.insert(0, _fts_query(matcher))
+        else:
+            sql = (
+                f"SELECT {columns}, NULL FROM articles a "
+                f"WHERE a.published >= ? AND a.source_key IN ({placeholders}) "
+                f"ORDER BY a.published DESC LIMIT ?"
+            )
+        params.append(limit)
+
+        with self._lock:
+            try:
+                rows = self._conn.execute(sql, params).fetchall()
+            except sqlite3.OperationalError as e:
+                logger.warning("Index search error: %s", e)
+                return []
+
+        articles = []
+        for row in rows:
+            record = dict(zip(ARTICLE_COLUMNS, row[:-1]))
+            body = row[-1] or ""
+            if matcher and not matcher.matches(f"{record['title']}\n{body}"):
+                continue
+            articles.append(Article(
+                title=record['title'],
+                url=record['link'],
+                source=record['source'],
+                score=record['score'],
+                published=record['published'],
+                comments=record['comments'],
+                discussion_url=record['discussion_url']
+            ))
+        return articles
+
+
+class NewsCrawler:
+    """Background thread that keeps a NewsIndex topped up
+
+    Every ``interval_s`` it pulls all configured sources without keyword filtering,
+    indexes the results and extracts bodies for up to ``extract_per_cycle`` new
+    articles so full-text search covers article content too.
+    """
+
+    def __init__(self, scraper, interval_s: float = 900, extract_per_cycle: int = 10):
+        self.scraper = scraper
+        self.interval_s = interval_s
+        self.extract_per_cycle = extract_per_cycle
+        self.last_run: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        # Clear first: a stop() during a running cycle must be undone, not just skipped
+        self._stop.clear()
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="news-crawler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.crawl_once()
+            except Exception as e:
+                logger.warning("Crawler error: %s", e)
+            self._stop.wait(self.interval_s)
+
+    def crawl_once(self):
+        """Pull every source into the index, then extract a batch of bodies"""
+        with span("crawler.cycle") as cycle_span:
+            # Pick up feeds added by any session since the last cycle
+            self.scraper.reload_feeds()
+            sources = self.scraper.available_sources()
+            self.scraper.refresh_index(sources)
+
+            index = self.scraper.news_index
+            urls = index.urls_without_body(sources, self.extract_per_cycle)
+            if urls and not self._stop.is_set():
+                for url, body in self.scraper.extract_articles(urls).items():
+                    # Store an empty body too so unextractable pages are not retried forever
+                    index.set_body(url, body or "")
+                cycle_span.set(extracted=len(urls))
+
+        self.last_run = time.time()
@@ -1,331 +1,907 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Optional, Union
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from urllib.parse import urlparse
+import io
+import json
+import logging
+import multiprocessing
+import os
+import threading
 import time
 
+from articles import Article
+from article_extractor import (
+    ParagraphCollector, extract_text_from_bytes, extract_text_from_html, incremental_decoder, is_html_content_type
+)
+from cache import DEFAULT_CACHE_DIR, ArticleContentCache, HTTPCache, HNItemStore
+from dedup import deduplicate_articles
+from feed_parser import iter_feed_items
+from http_fixtures import REPLAY, FixtureAdapter, FixtureStore
+from keyword_matcher import KeywordMatcher
+from news_index import NewsIndex
+from ranking import DEFAULT_COMMENT_WEIGHT, DEFAULT_HALF_LIFE_HOURS, rank_articles
+from source_health import SourceHealth, SourceUnavailable
+from sources import SourceRegistry
+from tracing import bind, current_span, span
+from urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+Keywords = Union[KeywordMatcher, List[str]]
+
+# One HTML parsing pool per process, shared by every scraper (i.e. every app session)
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool(processes: int) -> ProcessPoolExecutor:
+    """Process pool for CPU-bound HTML parsing, created on first use"""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            # Forking a process that runs I/O threads is unsafe; start workers from a clean interpreter
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _parse_pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context(method))
+        return _parse_pool
+
+
+def discard_parse_pool(pool: ProcessPoolExecutor):
+    """Drop a broken parse pool so the next get_parse_pool call starts a fresh one"""
+    global _parse_pool
+    with _parse_pool_lock:
+        # Another caller may already have replaced it
+        if _parse_pool is pool:
+            _parse_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+class HostRateLimiter:
+    """Per-host token buckets for outgoing requests
+    
+    ``limits`` maps a host to ``(requests_per_second, burst)``, or to None for no
+    limit. Other hosts get ``default`` (unlimited when None). ``acquire`` only
+    sleeps once a host's burst is spent.
+    """
+    
+    def __init__(self, limits: Optional[Dict[str, tuple]] = None, default: Optional[tuple] = None):
+        self.limits = dict(limits or {})
+        self.default = default
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self, url: str) -> float:
+        """Take one token for the URL's host, waiting if the bucket is empty; returns seconds waited"""
+        host = urlparse(url).netloc.lower()
+        limit = self.limits[host] if host in self.limits else self.default
+        if not limit:
+            return 0.0
+        rate, burst = limit
+        
+        with self._lock:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(host, (burst, now))
+            tokens = min(burst, tokens + (now - last) * rate)
+            # Reserve the token even if it is not there yet; callers queue up behind it
+            tokens -= 1
+            self._buckets[host] = [tokens, now]
+        
+        if tokens < 0:
+            time.sleep(-tokens / rate)
+            return -tokens / rate
+        return 0.0
+
+
 class NewsScraperModule:
-    """Free news scraping from HN, Reddit, TechCrunch, VentureBeat"""
+    """Free news scraping from HN, Reddit, VentureBeat and any RSS/Atom feed"""
+    
+    # Built-in source name (as shown in the UI) -> scraper method; feeds live in the registry
+    SOURCE_SCRAPERS = {
+        "Hacker News": "scrape_hackernews",
+        "Reddit": "scrape_reddit",
+        "VentureBeat": "scrape_venturebeat"
+    }
+    
+    # Per-request timeouts (seconds) keyed by the source passed to _get; feeds use "article"
+    DEFAULT_TIMEOUTS = {
+        "Hacker News": 10,
+        "Hacker News item": 5,
+        "Reddit": 10,
+        "VentureBeat": 15,
+        "article": 15
+    }
     
-    def __init__(self):
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    # Politeness limits per host: (requests per second, burst); None disables the limit
+    DEFAULT_HOST_LIMITS = {
+        "www.reddit.com": (1.0, 4),
+        "hacker-news.firebaseio.com": None
+    }
+    # Applied to every other host (feeds, article pages)
+    DEFAULT_HOST_LIMIT = (2.0, 5)
+    
+    REDDIT_SUBREDDITS = ['artificial', 'technology', 'machinelearning', 'OpenAI']
+    
+    # Seconds a cached feed is served without revalidating it against the origin
+    DEFAULT_FEED_TTLS = {
+        "Hacker News": 60,
+        "Reddit": 300,
+        "VentureBeat": 600
+    }
+    
+    # TTL for every other source, including registered feeds
+    DEFAULT_FEED_TTL = 600
+    
+    def __init__(self, hn_concurrency: int = 32, hn_scan_limit: int = 30, deadline_s: float = 8.0,
+                 timeouts: Optional[Dict[str, float]] = None, max_connections_per_host: int = 16,
+                 retries: int = 2, backoff_factor: float = 0.3, use_http_cache: bool = True,
+                 cache_dir: Optional[str] = None, feed_ttls: Optional[Dict[str, float]] = None,
+                 use_hn_item_store: bool = True, hn_item_ttl: float = 300,
+                 host_limits: Optional[Dict[str, tuple]] = None, reddit_pages: int = 2,
+                 max_article_bytes: int = 1_000_000, use_article_cache: bool = True,
+                 article_cache_ttl: float = 7 * 86400, article_cache_max_bytes: int = 50 * 1024 * 1024,
+                 prefetch_workers: int = 4, half_life_hours: float = DEFAULT_HALF_LIFE_HOURS,
+                 comment_weight: float = DEFAULT_COMMENT_WEIGHT, failure_threshold: int = 2,
+                 breaker_cooldown_s: float = 120.0, use_news_index: bool = True,
+                 index_stale_after: float = 900, index_history_days: int = 14,
+                 feeds_config: Optional[str] = None, max_source_workers: int = 32,
+                 fixture_mode: Optional[str] = None, fixtures_dir: Optional[str] = None,
+                 parse_processes: Optional[int] = None, extract_io_workers: int = 16):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
+        self.timeouts = {**self.DEFAULT_TIMEOUTS, **(timeouts or {})}
+        # "record" saves every response under fixtures_dir; "replay" serves them back offline
+        self.fixture_mode = fixture_mode
+        self.fixtures = FixtureStore(fixtures_dir) if fixture_mode else None
+        self.session = self._build_session(max_connections_per_host, retries, backoff_factor)
+        self.http_cache = HTTPCache(cache_dir) if use_http_cache else None
+        self.feed_ttls = {**self.DEFAULT_FEED_TTLS, **(feed_ttls or {})}
+        # HN items are only re-fetched when new or when score/comments are older than hn_item_ttl
+        self.hn_items = HNItemStore(cache_dir) if use_hn_item_store else None
+        self.hn_item_ttl = hn_item_ttl
+        # Replayed responses never reach the hosts, so there is nothing to be polite to
+        self.rate_limiter = HostRateLimiter() if fixture_mode == REPLAY else HostRateLimiter(
+            {**self.DEFAULT_HOST_LIMITS, **(host_limits or {})},
+            default=self.DEFAULT_HOST_LIMIT
+        )
+        self.reddit_pages = reddit_pages
+        # Hard cap on bytes downloaded per article page in streaming mode
+        self.max_article_bytes = max_article_bytes
+        self.article_cache = (
+            ArticleContentCache(cache_dir, ttl=article_cache_ttl, max_bytes=article_cache_max_bytes)
+            if use_article_cache else None
+        )
+        # Generic RSS/Atom feeds, persisted as JSON next to the caches
+        self.feeds_config = Path(feeds_config) if feeds_config else Path(cache_dir or DEFAULT_CACHE_DIR) / "feeds.json"
+        self.registry = SourceRegistry(reserved=list(self.SOURCE_SCRAPERS))
+        self.reload_feeds()
+        self.max_source_workers = max_source_workers
+        # Per-source success rate, latency and circuit breaker (article pages are not tracked)
+        self.failure_threshold = failure_threshold
+        self.breaker_cooldown_s = breaker_cooldown_s
+        self.source_health: Dict[str, SourceHealth] = {}
+        self._health_lock = threading.Lock()
+        for name in self.available_sources():
+            self._get_health(name)
+        # Local full-text index answering fetch_all_news; live scraping only tops up stale sources
+        self.news_index = NewsIndex(cache_dir) if use_news_index else None
+        self.index_stale_after = index_stale_after
+        self.index_history_days = index_history_days
+        # Ranking: score half-life and how much comment counts add to popularity
+        self.half_life_hours = half_life_hours
+        self.comment_weight = comment_weight
+        # Bulk extraction: downloads on I/O threads, HTML parsing on a process pool (0 disables;
+        # by default one process per core, none on a single core where it cannot help)
+        if parse_processes is None:
+            parse_processes = os.cpu_count() or 1
+            parse_processes = parse_processes if parse_processes > 1 else 0
+        self.parse_processes = parse_processes
+        self.extract_io_workers = extract_io_workers
+        # Background article extraction, keyed by canonical URL; created on first use
+        self.prefetch_workers = prefetch_workers
+        self._prefetch_pool: Optional[ThreadPoolExecutor] = None
+        self._prefetch: Dict[str, Future] = {}
+        self._prefetch_lock = threading.Lock()
+        # Max HN item requests in flight, and how many top story IDs to scan
+        self.hn_concurrency = max(1, hn_concurrency)
+        self.hn_scan_limit = hn_scan_limit
+        # Global budget for one fetch_all_news call, and per-source outcome of the last call
+        self.deadline_s = deadline_s
+        self.last_fetch_report: Dict[str, Dict] = {}
+    
+    def _build_session(self, max_connections_per_host: int, retries: int, backoff_factor: float) -> requests.Session:
+        """Create the keep-alive session shared by every scraper and the article extractor"""
+        retry_options = dict(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        try:
+            retry = Retry(backoff_jitter=backoff_factor, **retry_options)
+        except TypeError:
+            # urllib3 < 2.0 has no jitter support
+            retry = Retry(**retry_options)
+        
+        # pool_block caps concurrent connections per host instead of opening throwaway ones
+        adapter_options = dict(
+            pool_connections=32,
+            pool_maxsize=max_connections_per_host,
+            max_retries=retry,
+            pool_block=True
+        )
+        if self.fixtures is not None:
+            adapter = FixtureAdapter(self.fixtures, mode=self.fixture_mode, **adapter_options)
+        else:
+            adapter = HTTPAdapter(**adapter_options)
+        session = requests.Session()
+        session.headers.update(self.headers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
     
-    def fetch_all_news(self, keywords: str, timeframe_days: int = 7, sources: List[str] = None) -> List[Dict]:
-        """Fetch news from all sources and combine"""
-        all_articles = []
+    def _get(self, url: str, source: str, **kwargs) -> requests.Response:
+        """GET through the pooled session using the per-source timeout
         
-        if sources is None:
-            sources = ["Hacker News", "Reddit", "TechCrunch", "VentureBeat"]
-        
-        # Parse keywords - IMPORTANT: Empty string should result in empty list
-        keyword_list = []
-        if keywords and keywords.strip():
-            keyword_list = [k.strip().lower() for k in keywords.split(',') if k.strip()]
-        
-        print(f"\n{'='*60}")
-        print(f"FETCH_ALL_NEWS CALLED")
-        print(f"Sources: {sources}")
-        print(f"Keywords: {keyword_list if keyword_list else 'None (showing all)'}")
-        print(f"Timeframe: {timeframe_days} days")
-        print(f"{'='*60}\n")
-        
-        # Fetch from each source
-        if "Hacker News" in sources:
-            try:
-                print("[MAIN] Calling scrape_hackernews...")
-                hn_articles = self.scrape_hackernews(keyword_list, timeframe_days)
-                print(f"[MAIN] HN returned {len(hn_articles)} articles")
-                all_articles.extend(hn_articles)
-            except Exception as e:
-                print(f"[MAIN] HN error: {e}")
+        Outcomes feed the source's circuit breaker; while it is open the request
+        is refused with SourceUnavailable instead of waiting for a timeout.
+        """
+        kwargs.setdefault("timeout", self.timeouts.get(source, self.timeouts["article"]))
+        # Only source-level requests feed the breaker; "Hacker News item" and article
+        # lookups are untracked, so one bad item cannot take the whole source down
+        health = self._get_health(source)
+        if health and not health.allow_request():
+            raise SourceUnavailable(f"{health.name} is cooling down after repeated failures")
         
-        if "Reddit" in sources:
+        with span("http.get", source=source, host=urlparse(url).netloc) as http_span:
+            waited = self.rate_limiter.acquire(url)
+            if waited:
+                http_span.set(rate_limit_wait_ms=round(waited * 1000, 1))
+            start = time.monotonic()
             try:
-                print("[MAIN] Calling scrape_reddit...")
-                reddit_articles = self.scrape_reddit(keyword_list, timeframe_days)
-                print(f"[MAIN] Reddit returned {len(reddit_articles)} articles")
-                all_articles.extend(reddit_articles)
+                response = self.session.get(url, **kwargs)
             except Exception as e:
-                print(f"[MAIN] Reddit error: {e}")
+                if health:
+                    health.record_failure(str(e), time.monotonic() - start)
+                raise
+            
+            # Streamed bodies are read later, so only the declared length is known here
+            http_span.set(status=response.status_code, bytes=int(response.headers.get("Content-Length") or 0))
+            if health:
+                # Blocked (401/403), missing or failing feeds all count against the source
+                if response.status_code not in (200, 304):
+                    health.record_failure(f"HTTP {response.status_code}", time.monotonic() - start)
+                else:
+                    health.record_success(time.monotonic() - start)
+            return response
+    
+    def _get_health(self, name: str) -> Optional[SourceHealth]:
+        """Health tracker for a built-in source or feed (None for article pages)"""
+        if name not in self.SOURCE_SCRAPERS and name not in self.registry:
+            return None
+        with self._health_lock:
+            health = self.source_health.get(name)
+            if health is None:
+                health = SourceHealth(name, failure_threshold=self.failure_threshold, cooldown_s=self.breaker_cooldown_s)
+                self.source_health[name] = health
+            return health
+    
+    def health_report(self) -> List[Dict]:
+        """Snapshot of every source's health for display"""
+        with self._health_lock:
+            healths = list(self.source_health.values())
+        return [health.snapshot() for health in healths]
+    
+    def available_sources(self) -> List[str]:
+        """Built-in sources followed by every registered feed"""
+        return list(self.SOURCE_SCRAPERS) + self.registry.names
+    
+    def reload_feeds(self):
+        """Load the feed list from the JSON config, if one exists"""
+        if self.feeds_config.exists():
+            try:
+                self.registry.load_config(self.feeds_config)
+            except (OSError, ValueError) as e:
+                logger.warning("Could not load %s: %s", self.feeds_config, e)
+    
+    def save_feeds(self):
+        """Persist the current feed list so other sessions and the crawler pick it up"""
+        self.registry.save_config(self.feeds_config)
+    
+    def _get_cached(self, url: str, source: str) -> bytes:
+        """GET a feed through the on-disk conditional-request cache
+        
+        Fresh entries (younger than the source TTL) are served without touching the
+        network; stale ones are revalidated with If-None-Match / If-Modified-Since and
+        a 304 is answered from disk. Returns the body; a non-200 response raises
+        requests.HTTPError so the source is reported as failed.
+        """
+        with span("http.cached_get", source=source) as cache_span:
+            if self.http_cache is None:
+                response = self._get(url, source)
+                cache_span.set(cache="disabled", bytes=len(response.content))
+                self._check_status(response, url)
+                return response.content
+            
+            cached = self.http_cache.get(url)
+            if cached and cached.age < self.feed_ttls.get(source, self.DEFAULT_FEED_TTL):
+                cache_span.set(cache="fresh", bytes=len(cached.body))
+                return cached.body
+            
+            headers = {}
+            if cached and cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached and cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+            
+            response = self._get(url, source, headers=headers)
+            
+            if response.status_code == 304 and cached:
+                self.http_cache.touch(url)
+                cache_span.set(cache="revalidated", bytes=len(cached.body))
+                return cached.body
+            
+            cache_span.set(cache="miss", bytes=len(response.content))
+            self._check_status(response, url)
+            
+            self.http_cache.store(
+                url,
+                response.content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")
+            )
+            return response.content
+    
+    @staticmethod
+    def _check_status(response: requests.Response, url: str):
+        if response.status_code != 200:
+            raise requests.HTTPError(f"HTTP {response.status_code} for {url}", response=response)
+    
+    def fetch_all_news(self, keywords: str, timeframe_days: int = 7, sources: List[str] = None,
+                       deadline_s: Optional[float] = None, max_articles: Optional[int] = None) -> List[Article]:
+        """Fetch news from all sources concurrently, combine and rank
+        
+        With the local news index enabled, the answer is a local full-text query over
+        the index; sources whose last crawl is older than ``index_stale_after`` are
+        topped up live first. Without it every source is scraped live. Live fetches
+        run concurrently and the call returns after at most ``deadline_s`` seconds
+        with whatever finished. Per-source outcomes (status, article count, elapsed
+        time) are stored in ``last_fetch_report``. The merged list is ranked by
+        normalized, time-decayed popularity and cut to ``max_articles``.
+        """
+        if sources is None:
+            sources = self.available_sources()
+        if deadline_s is None:
+            deadline_s = self.deadline_s
         
-        if "TechCrunch" in sources:
+        # Compile keywords once for every scraper - an empty matcher accepts all titles
+        matcher = KeywordMatcher.from_string(keywords)
+        
+        with span("news.fetch_all", sources=list(sources), keywords=len(matcher.keywords),
+                  timeframe_days=timeframe_days, deadline_s=deadline_s) as fetch_span:
+            report: Dict[str, Dict] = {}
+            requested = [name for name in sources if name in self.SOURCE_SCRAPERS or name in self.registry]
+            selected = []
+            for name in requested:
+                if not self._get_health(name).available():
+                    logger.info("%s skipped - circuit open", name)
+                    report[name] = {"status": "skipped", "count": 0, "elapsed": 0.0}
+                    continue
+                selected.append(name)
+            
+            all_articles = []
+            if self.news_index is None:
+                results = self._run_sources(selected, matcher, timeframe_days, deadline_s, report)
+                for name in selected:
+                    all_articles.extend(results.get(name, []))
+            else:
+                now = time.time()
+                stale = [name for name in selected if now - self.news_index.last_crawled(name) > self.index_stale_after]
+                for name in selected:
+                    if name not in stale:
+                        report[name] = {"status": "indexed", "count": 0, "elapsed": 0.0}
+                if stale:
+                    self.refresh_index(stale, deadline_s, report)
+                
+                # Skipped and timed-out sources are still answered from earlier crawls
+                cutoff_ts = int(now - timeframe_days * 86400)
+                with span("news.index_search") as search_span:
+                    all_articles = self.news_index.search(matcher, cutoff_ts, requested)
+                    search_span.set(articles=len(all_articles))
+            
+            self.last_fetch_report = report
+            fetch_span.set(collected=len(all_articles))
+            
+            # The same story often arrives from HN, several subreddits and a feed
+            with span("news.dedup", articles=len(all_articles)) as dedup_span:
+                all_articles = deduplicate_articles(all_articles)
+                dedup_span.set(unique=len(all_articles))
+            
+            with span("news.rank", articles=len(all_articles)):
+                ranked_articles = rank_articles(
+                    all_articles,
+                    top_k=max_articles,
+                    half_life_hours=self.half_life_hours,
+                    comment_weight=self.comment_weight
+                )
+            fetch_span.set(returned=len(ranked_articles))
+            return ranked_articles
+    
+    def refresh_index(self, sources: List[str], deadline_s: Optional[float] = None,
+                      report: Optional[Dict[str, Dict]] = None):
+        """Scrape sources without keyword filtering and store the results in the news index"""
+        if self.news_index is None:
+            return
+        if report is None:
+            report = {}
+        
+        results = self._run_sources(sources, KeywordMatcher(), self.index_history_days, deadline_s, report)
+        # Failed and timed-out sources are left out of results, so they stay stale
+        for name, articles in results.items():
+            self.news_index.upsert_articles(name, articles)
+            self.news_index.mark_crawled(name)
+    
+    def _run_sources(self, names: List[str], matcher: KeywordMatcher, timeframe_days: int,
+                     deadline_s: Optional[float], report: Dict[str, Dict]) -> Dict[str, List[Article]]:
+        """Scrape sources concurrently under one deadline, recording each outcome in report"""
+        results: Dict[str, List[Article]] = {}
+        if not names:
+            return results
+        
+        pool = ThreadPoolExecutor(max_workers=min(len(names), self.max_source_workers), thread_name_prefix="news-source")
+        futures = {
+            pool.submit(bind(self._run_source), name, matcher, timeframe_days): name
+            for name in names
+        }
+        done, _ = wait(futures, timeout=deadline_s)
+        # Do not join stragglers - they finish in the background and are discarded
+        pool.shutdown(wait=False, cancel_futures=True)
+        
+        for future, name in futures.items():
+            if future not in done:
+                logger.warning("%s missed the %ss deadline", name, deadline_s)
+                report[name] = {"status": "timeout", "count": 0, "elapsed": deadline_s}
+                continue
+            
+            articles, elapsed, error = future.result()
+            if error:
+                logger.warning("%s error: %s", name, error)
+                report[name] = {"status": "error", "count": 0, "elapsed": elapsed, "error": error}
+                continue
+            
+            report[name] = {"status": "ok", "count": len(articles), "elapsed": elapsed}
+            results[name] = articles
+        return results
+    
+    def _run_source(self, name: str, matcher: KeywordMatcher, timeframe_days: int):
+        """Run one source scraper, returning (articles, elapsed seconds, error message)"""
+        start = time.monotonic()
+        with span("news.source", source=name) as source_span:
             try:
-                print("[MAIN] Calling scrape_techcrunch...")
-                tc_articles = self.scrape_techcrunch(keyword_list, timeframe_days)
-                print(f"[MAIN] TechCrunch returned {len(tc_articles)} articles")
-                all_articles.extend(tc_articles)
+                if name in self.SOURCE_SCRAPERS:
+                    articles = getattr(self, self.SOURCE_SCRAPERS[name])(matcher, timeframe_days)
+                else:
+                    feed = self.registry.get(name)
+                    articles = self.scrape_feed(feed.url, feed.name, matcher, timeframe_days, limit=feed.limit)
+                source_span.set(articles=len(articles))
+                return articles, time.monotonic() - start, None
             except Exception as e:
-                print(f"[MAIN] TechCrunch error: {e}")
+                source_span.set(error=str(e))
+                return [], time.monotonic() - start, str(e)
+    
+    def scrape_hackernews(self, keywords: Keywords, days: int = 7, scan_limit: Optional[int] = None) -> List[Article]:
+        """Scrape Hacker News top stories
+        
+        Item lookups run on a bounded thread pool (``hn_concurrency``), so scanning
+        100 or 500 IDs costs roughly one round trip per batch instead of one per item.
+        Known items come from the local item store, so only new IDs and items with
+        stale score/comment counts hit the network. Results keep the
+        ``topstories.json`` ranking order.
+        """
+        matcher = KeywordMatcher.coerce(keywords)
+        articles = []
+        url = "https://hacker-news.firebaseio.com/v0/topstories.json"
+        body = self._get_cached(url, "Hacker News")
+        story_ids = json.loads(body)[:scan_limit or self.hn_scan_limit]
+        
+        cutoff_date = datetime.now() - timedelta(days=days)
+        
+        stories = self._load_hn_items(story_ids)
         
-        if "VentureBeat" in sources:
+        for story_id, story in zip(story_ids, stories):
             try:
-                print("[MAIN] Calling scrape_venturebeat...")
-                vb_articles = self.scrape_venturebeat(keyword_list, timeframe_days)
-                print(f"[MAIN] VentureBeat returned {len(vb_articles)} articles")
-                all_articles.extend(vb_articles)
-            except Exception as e:
-                print(f"[MAIN] VentureBeat error: {e}")
+                if not story or 'title' not in story:
+                    continue
+                
+                story_date = datetime.fromtimestamp(story.get('time', 0))
+                if story_date < cutoff_date:
+                    continue
+                
+                if not matcher.matches(story.get('title', '')):
+                    continue
+                
+                articles.append(Article(
+                    title=story.get('title'),
+                    url=story.get('url', f"https://news.ycombinator.com/item?id={story_id}"),
+                    source='Hacker News',
+                    score=story.get('score', 0),
+                    published=story.get('time', 0),
+                    comments=story.get('descendants', 0),
+                    discussion_url=f"https://news.ycombinator.com/item?id={story_id}"
+                ))
+            except Exception:
+                continue
+        
+        return articles
+    
+    def _load_hn_items(self, story_ids: List[int]) -> List[Optional[Dict]]:
+        """Resolve HN items from the local store, fetching only new or stale ones"""
+        stored = self.hn_items.get_many(story_ids) if self.hn_items else {}
+        now = time.time()
+        to_fetch = [
+            story_id for story_id in story_ids
+            if story_id not in stored or now - stored[story_id]["refreshed_at"] > self.hn_item_ttl
+        ]
         
-        print(f"\n[MAIN] TOTAL ARTICLES COLLECTED: {len(all_articles)}")
+        if to_fetch:
+            workers = min(self.hn_concurrency, len(to_fetch))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hn-item") as pool:
+                fetched = dict(zip(to_fetch, pool.map(bind(self._fetch_hn_item), to_fetch)))
+            
+            fresh = [item for item in fetched.values() if item and 'title' in item]
+            if self.hn_items:
+                self.hn_items.upsert_many(fresh)
+            for item in fresh:
+                if item["id"] in stored:
+                    # Permanent fields stay as stored; only volatile ones change
+                    stored[item["id"]].update(score=item.get("score", 0), descendants=item.get("descendants", 0))
+                else:
+                    stored[item["id"]] = item
         
-        # Sort by score/popularity
-        sorted_articles = sorted(all_articles, key=lambda x: x.get('score', 0), reverse=True)
-        print(f"[MAIN] Returning {len(sorted_articles)} articles after sorting\n")
-        return sorted_articles
+        # A failed refresh falls back to the last stored copy
+        return [stored.get(story_id) for story_id in story_ids]
     
-    def scrape_hackernews(self, keywords: List[str], days: int = 7) -> List[Dict]:
-        """Scrape Hacker News top stories"""
-        articles = []
+    def _fetch_hn_item(self, story_id: int) -> Optional[Dict]:
+        """Fetch a single HN item, returning None on any failure"""
         try:
-            url = "https://hacker-news.firebaseio.com/v0/topstories.json"
-            response = requests.get(url, timeout=10)
-            story_ids = response.json()[:100]
-            
-            cutoff_date = datetime.now() - timedelta(days=days)
+            story_url = f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
+            return self._get(story_url, "Hacker News item").json()
+        except Exception:
+            return None
+    
+    def scrape_reddit(self, keywords: Keywords, days: int = 7, pages: Optional[int] = None) -> List[Article]:
+        """Scrape the combined top listing of the tracked subreddits
+        
+        One ``r/a+b+c+d`` request per page (following the ``after`` cursor) replaces a
+        request per subreddit; each post is attributed via its ``subreddit`` field.
+        """
+        matcher = KeywordMatcher.coerce(keywords)
+        articles = []
+        base_url = f"https://www.reddit.com/r/{'+'.join(self.REDDIT_SUBREDDITS)}/top/.json?t=week&limit=100"
+        after = None
+        
+        for page in range(pages or self.reddit_pages):
+            url = f"{base_url}&after={after}" if after else base_url
+            try:
+                data = json.loads(self._get_cached(url, "Reddit")).get('data', {})
+            except Exception as e:
+                # Later pages only add to what was already collected; a first-page failure fails the source
+                if page == 0:
+                    raise
+                logger.warning("Reddit page %d error: %s", page + 1, e)
+                break
             
-            for story_id in story_ids[:30]:
+            for post in data.get('children', []):
                 try:
-                    story_url = f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
-                    story = requests.get(story_url, timeout=5).json()
-                    
-                    if not story or 'title' not in story:
-                        continue
+                    post_data = post.get('data', {})
+                    title = post_data.get('title', '')
                     
-                    story_date = datetime.fromtimestamp(story.get('time', 0))
-                    if story_date < cutoff_date:
+                    if not title:
                         continue
                     
-                    # FIXED: Only filter by keywords if keywords were provided
-                    title_lower = story.get('title', '').lower()
-                    if keywords and not any(kw in title_lower for kw in keywords):
+                    if not matcher.matches(title):
                         continue
                     
-                    articles.append({
-                        'title': story.get('title'),
-                        'url': story.get('url', f"https://news.ycombinator.com/item?id={story_id}"),
-                        'source': 'Hacker News',
-                        'score': story.get('score', 0),
-                        'date': story_date.strftime('%Y-%m-%d'),
-                        'comments': story.get('descendants', 0)
-                    })
+                    articles.append(Article(
+                        title=title,
+                        url=post_data.get('url', ''),
+                        source=f"Reddit r/{post_data.get('subreddit', 'all')}",
+                        score=post_data.get('score', 0),
+                        published=post_data.get('created_utc', 0),
+                        comments=post_data.get('num_comments', 0),
+                        discussion_url=f"https://www.reddit.com{post_data.get('permalink', '')}"
+                    ))
                 except Exception:
                     continue
-                    
-        except Exception as e:
-            print(f"[HN] ERROR: {e}")
+            
+            after = data.get('after')
+            if not after:
+                break
         
         return articles
     
-    def scrape_reddit(self, keywords: List[str], days: int = 7) -> List[Dict]:
-        """Scrape Reddit r/artificial and r/technology"""
+    def scrape_feed(self, url: str, source: str, keywords: Keywords, days: int = 7, limit: int = 30) -> List[Article]:
+        """Scrape any RSS/Atom feed with the incremental feed parser
+        
+        Parsing stops after ``limit`` items or at the first item older than the
+        timeframe, so large feeds are never fully materialized.
+        """
+        matcher = KeywordMatcher.coerce(keywords)
         articles = []
-        subreddits = ['artificial', 'technology', 'machinelearning', 'OpenAI']
+        body = self._get_cached(url, source)
         
-        try:
-            for subreddit in subreddits:
-                try:
-                    url = f"https://www.reddit.com/r/{subreddit}/top/.json?t=week&limit=25"
-                    response = requests.get(url, headers=self.headers, timeout=10)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        posts = data.get('data', {}).get('children', [])
-                        
-                        for post in posts:
-                            post_data = post.get('data', {})
-                            title = post_data.get('title', '')
-                            
-                            if not title:
-                                continue
-                            
-                            # FIXED: Only filter by keywords if keywords were provided
-                            title_lower = title.lower()
-                            if keywords and not any(kw in title_lower for kw in keywords):
-                                continue
-                            
-                            articles.append({
-                                'title': title,
-                                'url': post_data.get('url', ''),
-                                'source': f'Reddit r/{subreddit}',
-                                'score': post_data.get('score', 0),
-                                'date': datetime.fromtimestamp(
-                                    post_data.get('created_utc', 0)
-                                ).strftime('%Y-%m-%d'),
-                                'comments': post_data.get('num_comments', 0)
-                            })
-                    
-                    time.sleep(1)
-                except Exception:
-                    continue
-                    
-        except Exception as e:
-            print(f"Reddit error: {e}")
+        now = time.time()
+        cutoff_ts = int(now - days * 86400)
         
-        return articles
-    
-    def scrape_techcrunch(self, keywords: List[str], days: int = 7) -> List[Dict]:
-        """Scrape TechCrunch using their RSS feed"""
-        articles = []
-        try:
-            url = "https://techcrunch.com/feed/"
-            response = requests.get(url, headers=self.headers, timeout=15)
-            
-            if response.status_code != 200:
-                return articles
-                
-            soup = BeautifulSoup(response.content, 'xml')
-            items = soup.find_all('item', limit=30)
+        for item in iter_feed_items(io.BytesIO(body), limit=limit, cutoff_ts=cutoff_ts):
+            title = item['title']
             
-            cutoff_date = datetime.now() - timedelta(days=days)
+            if not matcher.matches(title):
+                continue
             
-            for item in items:
-                try:
-                    title_elem = item.find('title')
-                    link_elem = item.find('link')
-                    date_elem = item.find('pubDate')
-                    
-                    if not title_elem or not link_elem:
-                        continue
-                    
-                    title = title_elem.get_text(strip=True)
-                    link = link_elem.get_text(strip=True)
-                    
-                    if not title or not link:
-                        continue
-                    
-                    if date_elem:
-                        date_str = date_elem.get_text(strip=True)
-                        try:
-                            from email.utils import parsedate_to_datetime
-                            article_date = parsedate_to_datetime(date_str)
-                            if article_date.replace(tzinfo=None) < cutoff_date:
-                                continue
-                            formatted_date = article_date.strftime('%Y-%m-%d')
-                        except:
-                            formatted_date = datetime.now().strftime('%Y-%m-%d')
-                    else:
-                        formatted_date = datetime.now().strftime('%Y-%m-%d')
-                    
-                    # FIXED: Only filter by keywords if keywords were provided
-                    title_lower = title.lower()
-                    if keywords and not any(kw in title_lower for kw in keywords):
-                        continue
-                    
-                    articles.append({
-                        'title': title,
-                        'url': link,
-                        'source': 'TechCrunch',
-                        'score': 100,
-                        'date': formatted_date,
-                        'comments': 0
-                    })
-                    
-                except Exception:
-                    continue
-                    
-        except Exception as e:
-            print(f"[TC] ERROR: {e}")
+            articles.append(Article(
+                title=title,
+                url=item['link'],
+                source=source,
+                score=100,
+                published=item['published'] or int(now)
+            ))
         
         return articles
     
-    def scrape_venturebeat(self, keywords: List[str], days: int = 7) -> List[Dict]:
+    def scrape_venturebeat(self, keywords: Keywords, days: int = 7) -> List[Article]:
         """Scrape VentureBeat AI section"""
+        matcher = KeywordMatcher.coerce(keywords)
         articles = []
-        try:
-            url = "https://venturebeat.com/category/ai/"
-            response = requests.get(url, headers=self.headers, timeout=15)
-            
-            if response.status_code != 200:
-                return articles
+        url = "https://venturebeat.com/category/ai/"
+        body = self._get_cached(url, "VentureBeat")
+        
+        soup = BeautifulSoup(body, 'html.parser')
+        article_elements = soup.find_all('article', limit=20)
+        
+        for article in article_elements:
+            try:
+                title_elem = article.find('h2', class_='article-title')
+                if not title_elem:
+                    title_elem = article.find('h3') or article.find('h2')
                 
-            soup = BeautifulSoup(response.content, 'html.parser')
-            article_elements = soup.find_all('article', limit=20)
-            
-            for article in article_elements:
-                try:
-                    title_elem = article.find('h2', class_='article-title')
-                    if not title_elem:
-                        title_elem = article.find('h3') or article.find('h2')
-                    
-                    if not title_elem:
-                        continue
-                    
-                    link_elem = title_elem.find('a')
-                    if not link_elem:
-                        continue
-                    
-                    title = link_elem.get_text(strip=True)
-                    if not title:
-                        continue
-                    
-                    # FIXED: Only filter by keywords if keywords were provided
-                    title_lower = title.lower()
-                    if keywords and not any(kw in title_lower for kw in keywords):
-                        continue
-                    
-                    link = link_elem.get('href', '')
-                    if not link:
-                        continue
-                    
-                    articles.append({
-                        'title': title,
-                        'url': link,
-                        'source': 'VentureBeat',
-                        'score': 100,
-                        'date': datetime.now().strftime('%Y-%m-%d'),
-                        'comments': 0
-                    })
-                except Exception:
+                if not title_elem:
                     continue
-                    
-        except Exception as e:
-            print(f"[VB] ERROR: {e}")
+                
+                link_elem = title_elem.find('a')
+                if not link_elem:
+                    continue
+                
+                title = link_elem.get_text(strip=True)
+                if not title:
+                    continue
+                
+                if not matcher.matches(title):
+                    continue
+                
+                link = link_elem.get('href', '')
+                if not link:
+                    continue
+                
+                articles.append(Article(
+                    title=title,
+                    url=link,
+                    source='VentureBeat',
+                    score=100,
+                    published=int(time.time())
+                ))
+            except Exception:
+                continue
         
         return articles
     
-    def extract_article_content(self, url: str) -> str:
-        """Extract main content from article URL"""
+    def extract_article_content(self, url: str, stream: bool = True) -> str:
+        """Extract main content from article URL
+        
+        In streaming mode the page is read in chunks (at most ``max_article_bytes``)
+        and parsed incrementally; the download stops as soon as enough paragraph
+        text has been collected. Non-HTML responses are rejected from the headers.
+        ``stream=False`` downloads the whole page and parses it with BeautifulSoup.
+        Extracted text is cached by canonical URL, so regenerating from the same
+        article never hits the network twice.
+        """
         if not url:
             return ""
+        
+        cache_key = canonicalize_url(url)
+        with span("extract", host=urlparse(url).netloc, stream=stream) as extract_span:
+            with self._prefetch_lock:
+                pending = self._prefetch.get(cache_key)
+            # A job still queued behind other prefetches would make the click wait for
+            # all of them; cancel it and extract inline. Only wait on running jobs.
+            if pending is not None and not pending.cancel():
+                try:
+                    text = pending.result()
+                    extract_span.set(origin="prefetch", chars=len(text))
+                    return text
+                except Exception:
+                    # Cancelled or failed prefetch - extract inline instead
+                    pass
             
+            text = self._extract_and_cache(url, cache_key, stream)
+            extract_span.set(chars=len(text))
+            return text
+    
+    def _extract_and_cache(self, url: str, cache_key: str, stream: bool = True, in_process: bool = False) -> str:
+        """Serve article text from the content cache, extracting and storing it on a miss
+        
+        ``in_process`` downloads on the calling thread and parses on the process pool.
+        """
+        if self.article_cache:
+            cached = self.article_cache.get(cache_key)
+            if cached is not None:
+                with span("extract.cache_hit", chars=len(cached)):
+                    return cached
+        
+        if in_process:
+            text = self._download_and_parse_in_process(url)
+        else:
+            with span("extract.download", stream=stream) as download_span:
+                text = self._download_article_text(url, stream)
+                download_span.set(chars=len(text))
+        if text and self.article_cache:
+            self.article_cache.put(cache_key, text)
+        return text
+    
+    def extract_articles(self, urls: List[str]) -> Dict[str, str]:
+        """Extract many articles at once, returning {url: text}
+        
+        Pages are downloaded on ``extract_io_workers`` threads and each raw body is
+        handed to the process pool for parsing, so large batches use every core
+        instead of contending for the GIL. Results go through the content cache.
+        """
+        urls = [url for url in dict.fromkeys(urls) if url]
+        if not urls:
+            return {}
+        
+        in_process = self.parse_processes > 0
+        with span("extract.bulk", articles=len(urls), processes=self.parse_processes):
+            workers = min(self.extract_io_workers, len(urls))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="article-io") as pool:
+                texts = pool.map(
+                    bind(lambda url: self._extract_and_cache(url, canonicalize_url(url), in_process=in_process)),
+                    urls
+                )
+                return dict(zip(urls, texts))
+    
+    def _download_and_parse_in_process(self, url: str) -> str:
+        """Download raw HTML here (I/O thread), parse it on the process pool"""
+        with span("extract.download", stream=True) as download_span:
+            body, encoding = self._download_article_bytes(url)
+            download_span.set(bytes=len(body))
+        if not body:
+            return ""
+        
+        with span("extract.parse", bytes=len(body)) as parse_span:
+            pool = None
+            try:
+                pool = get_parse_pool(self.parse_processes)
+                text = pool.submit(extract_text_from_bytes, body, encoding).result()
+            except (BrokenProcessPool, OSError, RuntimeError) as e:
+                # No usable process pool here (e.g. restricted sandbox) - parse inline from now on
+                logger.warning("Process pool unavailable, parsing in threads: %s", e)
+                if isinstance(e, BrokenProcessPool):
+                    # The pool is shared; don't leave other scrapers submitting to a dead one
+                    discard_parse_pool(pool)
+                self.parse_processes = 0
+                text = extract_text_from_bytes(body, encoding)
+            parse_span.set(chars=len(text))
+            return text
+    
+    @staticmethod
+    def _article_encoding(response: requests.Response) -> str:
+        # requests defaults text/* without a charset to ISO-8859-1; most pages are UTF-8
+        content_type = response.headers.get('Content-Type', '')
+        return response.encoding if 'charset' in content_type.lower() else 'utf-8'
+    
+    def _download_article_bytes(self, url: str):
+        """Raw HTML of an article page (capped at ``max_article_bytes``) and its encoding
+        
+        Returns empty bytes on any failure or non-HTML response.
+        """
         try:
-            response = requests.get(url, headers=self.headers, timeout=15)
-            
-            if response.status_code != 200:
-                return ""
+            with self._get(url, "article", stream=True) as response:
+                if response.status_code != 200:
+                    return b"", None
+                if not is_html_content_type(response.headers.get('Content-Type', '')):
+                    return b"", None
                 
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            for script in soup(['script', 'style', 'nav', 'footer', 'aside', 'header']):
-                script.decompose()
-            
-            selectors = [
-                'article',
-                '[class*="article-content"]',
-                '[class*="post-content"]',
-                '[class*="entry-content"]',
-                '[class*="story-body"]',
-                'main'
-            ]
-            
-            content = None
-            for selector in selectors:
-                content = soup.select_one(selector)
-                if content:
-                    break
-            
-            if content:
-                paragraphs = content.find_all('p')
-                text = ' '.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-                if text:
-                    return text[:5000]
+                chunks = []
+                bytes_read = 0
+                for chunk in response.iter_content(chunk_size=65536):
+                    chunks.append(chunk)
+                    bytes_read += len(chunk)
+                    if bytes_read >= self.max_article_bytes:
+                        break
+                return b"".join(chunks)[:self.max_article_bytes], self._article_encoding(response)
+        except Exception as e:
+            logger.warning("Content download error for %s: %s", url, e)
+            return b"", None
+    
+    def prefetch_articles(self, articles: List[Article], top_n: int = 10):
+        """Extract content for the top-N articles on a background pool
+        
+        Replaces the previous prefetch batch: its pending jobs are cancelled.
+        ``extract_article_content`` waits on a prefetch that is already running
+        instead of starting a second download of the same page; a job that is
+        still queued is cancelled and extracted inline.
+        """
+        self.cancel_prefetch()
+        
+        with self._prefetch_lock:
+            if self._prefetch_pool is None:
+                self._prefetch_pool = ThreadPoolExecutor(
+                    max_workers=self.prefetch_workers, thread_name_prefix="article-prefetch"
+                )
+            for article in articles[:top_n]:
+                url = article.url
+                if not url:
+                    continue
+                cache_key = canonicalize_url(url)
+                if cache_key not in self._prefetch:
+                    self._prefetch[cache_key] = self._prefetch_pool.submit(self._prefetch_one, url, cache_key)
+    
+    def _prefetch_one(self, url: str, cache_key: str) -> str:
+        # Traced as its own root: prefetch often outlives the click that started it
+        with span("extract.prefetch", host=urlparse(url).netloc):
+            return self._extract_and_cache(url, cache_key)
+    
+    def cancel_prefetch(self):
+        """Cancel prefetch jobs that have not started and forget the current batch"""
+        with self._prefetch_lock:
+            for future in self._prefetch.values():
+                future.cancel()
+            self._prefetch = {}
+    
+    def _download_article_text(self, url: str, stream: bool = True) -> str:
+        """Fetch and extract article text, bypassing the content cache"""
+        try:
+            if not stream:
+                response = self._get(url, "article")
+                if response.status_code != 200:
+                    return ""
+                return extract_text_from_html(response.content)
             
-            paragraphs = soup.find_all('p')
-            text = ' '.join([p.get_text(strip=True) for p in paragraphs[:15] if p.get_text(strip=True)])
-            return text[:5000] if text else ""
+            with self._get(url, "article", stream=True) as response:
+                if response.status_code != 200:
+                    return ""
+                
+                content_type = response.headers.get('Content-Type', '')
+                if not is_html_content_type(content_type):
+                    return ""
+                
+                decoder = incremental_decoder(self._article_encoding(response))
+                
+                collector = ParagraphCollector()
+                bytes_read = 0
+                for chunk in response.iter_content(chunk_size=16384):
+                    bytes_read += len(chunk)
+                    collector.feed(decoder.decode(chunk))
+                    if collector.done or bytes_read >= self.max_article_bytes:
+                        break
+                
+                collector.feed(decoder.decode(b'', final=True))
+                collector.close()
+                download_span = current_span()
+                if download_span:
+                    download_span.set(bytes=bytes_read)
+                return collector.text()
             
         except Exception as e:
-            print(f"Content extraction error: {e}")
-            return ""
\ No newline at end of file
+            logger.warning("Content extraction error for %s: %s", url, e)
+            return ""
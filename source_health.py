@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class SourceUnavailable(Exception):
+    """Raised instead of a request while a source's circuit breaker is open"""
+
+
+class SourceHealth:
+    """Success rate, latency and circuit breaker state for one news source
+
+    After ``failure_threshold`` consecutive failures the circuit opens and requests
+    are refused for ``cooldown_s`` seconds. The first request after the cool-down is
+    let through as a single trial: success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 2, cooldown_s: float = 120.0, window: int = 20):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.latency_ewma: Optional[float] = None
+        self._outcomes = deque(maxlen=window)
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """True if a request would currently be allowed (does not claim the trial slot)"""
+        with self._lock:
+            if self.state == OPEN:
+                return time.monotonic() - self.opened_at >= self.cooldown_s
+            if self.state == HALF_OPEN:
+                return not self._probe_in_flight
+            return True
+
+    def allow_request(self) -> bool:
+        """Claim permission for one request, moving OPEN -> HALF_OPEN after the cool-down"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown_s:
+                    return False
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self._outcomes.append(True)
+            self.consecutive_failures = 0
+            self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+            self.state = CLOSED
+            self._probe_in_flight = False
+
+    def record_failure(self, error: str, latency: Optional[float] = None):
+        with self._lock:
+            self._outcomes.append(False)
+            self.consecutive_failures += 1
+            self.last_error = error
+            if latency is not None:
+                self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    @property
+    def success_rate(self) -> Optional[float]:
+        if not self._outcomes:
+            return None
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def snapshot(self) -> Dict:
+        """Plain-dict view for display"""
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = max(0.0, self.cooldown_s - (time.monotonic() - self.opened_at))
+            return {
+                "source": self.name,
+                "state": self.state,
+                "success_rate": self.success_rate,
+                "latency_s": self.latency_ewma,
+                "requests": len(self._outcomes),
+                "retry_in_s": retry_in,
+                "last_error": self.last_error
+            }
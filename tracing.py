@@ -0,0 +1,155 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from cache import DEFAULT_CACHE_DIR
+
+# Spans are appended here as JSON lines; override with POST_GENERATOR_TRACE_FILE
+DEFAULT_TRACE_FILE = Path(
+    os.environ.get("POST_GENERATOR_TRACE_FILE", DEFAULT_CACHE_DIR / "traces.jsonl")
+)
+# The trace file is rotated to ``<name>.1`` once it grows past this size
+MAX_TRACE_BYTES = 5 * 1024 * 1024
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed stage: name, duration and free-form attributes"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "started_at", "duration_ms",
+                 "attrs", "status", "error", "_start")
+
+    def __init__(self, name: str, parent: Optional["Span"], attrs: Dict):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.started_at = time.time()
+        self.duration_ms: Optional[float] = None
+        self.attrs = attrs
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self._start = time.perf_counter()
+
+    def set(self, **attrs):
+        """Attach attributes (sizes, counts, status codes, ...)"""
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> Dict:
+        return {
+            "trace": self.trace_id,
+            "span": self.span_id,
+            "parent": self.parent_id,
+            "name": self.name,
+            "start": round(self.started_at, 3),
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "thread": threading.current_thread().name,
+            "attrs": self.attrs
+        }
+
+
+class Tracer:
+    """Collects spans into a JSONL file and a bounded in-memory buffer
+
+    Spans nest through a context variable, so a span opened inside another one
+    (on the same thread, or on a worker started through ``bind``) records it as
+    its parent and shares its trace id. Writing is best-effort: a trace file that
+    cannot be written never breaks the traced code.
+    """
+
+    def __init__(self, path: Optional[Path] = DEFAULT_TRACE_FILE, keep: int = 5000, enabled: bool = True):
+        self.path = Path(path) if path else None
+        self.enabled = enabled
+        self._recent = deque(maxlen=keep)
+        self._lock = threading.Lock()
+        self._file = None
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Span]:
+        """Time the enclosed block as a span named ``name``"""
+        span = Span(name, _current_span.get(), attrs)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            span.status = "error"
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.duration_ms = round((time.perf_counter() - span._start) * 1000, 3)
+            if self.enabled:
+                self._emit(span.to_dict())
+
+    def _emit(self, record: Dict):
+        with self._lock:
+            self._recent.append(record)
+            if self.path is None:
+                return
+            try:
+                if self._file is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write(json.dumps(record, default=str) + "\n")
+                self._file.flush()
+                if self._file.tell() > MAX_TRACE_BYTES:
+                    self._file.close()
+                    self._file = None
+                    os.replace(self.path, self.path.with_name(self.path.name + ".1"))
+            except OSError:
+                self._file = None
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict]:
+        """Most recent finished spans, oldest first"""
+        with self._lock:
+            spans = list(self._recent)
+        return spans[-limit:] if limit else spans
+
+    def traces(self, limit: int = 10, where: Optional[Callable[[Dict], bool]] = None) -> List[List[Dict]]:
+        """Spans of the last ``limit`` traces whose root span has finished, newest trace first
+
+        Spans are in finishing order; the root (``parent`` is None) is not
+        necessarily last, since bound background work may outlive it. ``where``
+        filters traces by their root span, e.g. to one app session.
+        """
+        spans = self.recent()
+        by_trace: Dict[str, List[Dict]] = {}
+        roots = []
+        for record in spans:
+            by_trace.setdefault(record["trace"], []).append(record)
+            if record["parent"] is None and (where is None or where(record)):
+                roots.append(record["trace"])
+        return [by_trace[trace_id] for trace_id in reversed(roots[-limit:])]
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def bind(fn: Callable) -> Callable:
+    """Wrap fn so it runs under the caller's current span, e.g. on a thread pool"""
+    parent = _current_span.get()
+
+    def run(*args, **kwargs):
+        token = _current_span.set(parent)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current_span.reset(token)
+
+    return run
+
+
+# Process-wide tracer shared by the scraper and the app
+tracer = Tracer()
+span = tracer.span
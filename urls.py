@@ -0,0 +1,53 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the click and never change the page
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid', 'ref', 'ref_src',
+    'cmpid', 'ncid', 'guccounter', 'guce_referrer', 'guce_referrer_sig', '_hsenc', '_hsmi',
+    'mkt_tok', 'spm', 'sr_share', 'share', 'src', 'tpcc'
+}
+TRACKING_PREFIXES = ('utm_',)
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so different links to the same page compare equal
+
+    Lowercases scheme and host, treats http as https, drops ``www.``, default
+    ports, fragments, trailing slashes and tracking parameters, and sorts the
+    remaining query string.
+    """
+    if not url:
+        return ""
+
+    try:
+        parts = urlsplit(url.strip())
+        host = (parts.hostname or "").lower()
+        port = parts.port
+    except ValueError:
+        return url.strip()
+
+    if not host:
+        return url.strip()
+
+    scheme = parts.scheme.lower() or "https"
+    if scheme == "http":
+        scheme = "https"
+    if host.startswith("www."):
+        host = host[4:]
+    netloc = host if port in (None, 80, 443) else f"{host}:{port}"
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    )
+
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))